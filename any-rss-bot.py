@@ -44,7 +44,7 @@ def main():
         loop.run_forever()
     except KeyboardInterrupt:
         logging.info("Ctrl-C close!!")
-        telegram_bot.close_all()
+        loop.run_until_complete(telegram_bot.close_all())
     finally:
         loop.close()
 
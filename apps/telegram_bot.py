@@ -5,6 +5,7 @@ import logging
 import asyncio
 from telegram.request import HTTPXRequest
 import services
+from services.common.async_logging import setup_async_logging
 
 tel_bots = {}
 commands = [
@@ -121,14 +122,19 @@ async def run(token):
 
 async def init_task():
     logging.info("Initializing Telegram bot")
+    # 切换为异步日志，命令处理路径上的日志调用不再同步写入
+    setup_async_logging()
 
 
 async def start_task(token):
     return await run(token)
 
 
-def close_all():
+async def close_all():
     logging.info("Closing Telegram bot")
+    # 释放抖音获取器共享的异步HTTP连接
+    from services.douyin1.fetcher import close_async_client
+    await close_async_client()
 
 
 async def scheduled_task(token):
@@ -4,7 +4,7 @@ Douyin到Douyin1数据迁移脚本
 
 功能：
 1. 迁移订阅数据 (subscriptions.json)
-2. 迁移已知内容ID (known_item_ids.json)
+2. 迁移已知内容ID (known_item_ids.json -> known_item_ids.log)
 3. 迁移消息映射 (message_mappings.json)
 4. 建立URL到目录的映射关系
 5. 验证迁移结果
@@ -23,6 +23,9 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+# douyin1已知内容ID日志文件名（每行一个ID，与services/douyin1/manager.py保持一致）
+KNOWN_IDS_LOG_FILENAME = "known_item_ids.log"
+
 
 class DouyinMigrator:
     """Douyin数据迁移器"""
@@ -207,6 +210,39 @@ class DouyinMigrator:
             self.stats["errors"].append(f"迁移订阅数据失败: {e}")
             return False
     
+    def _load_target_known_items(self, target_dir: Path) -> Optional[List[str]]:
+        """
+        读取douyin1目标目录的已知内容ID（优先读取日志文件，不存在时回退到JSON文件）
+        
+        Args:
+            target_dir: 目标URL目录
+            
+        Returns:
+            Optional[List[str]]: 已知内容ID列表，两种文件都不存在时返回None
+        """
+        log_file = target_dir / KNOWN_IDS_LOG_FILENAME
+        if log_file.exists():
+            return [line for line in log_file.read_text(encoding='utf-8').splitlines() if line]
+        
+        json_file = target_dir / "known_item_ids.json"
+        if json_file.exists():
+            with open(json_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+    
+    def _write_target_known_items(self, target_dir: Path, known_items: List[str]):
+        """
+        以douyin1的日志格式写入已知内容ID，并删除旧的JSON文件
+        
+        Args:
+            target_dir: 目标URL目录
+            known_items: 已知内容ID列表
+        """
+        target_dir.mkdir(parents=True, exist_ok=True)
+        log_file = target_dir / KNOWN_IDS_LOG_FILENAME
+        log_file.write_text(''.join(f"{item_id}\n" for item_id in known_items), encoding='utf-8')
+        (target_dir / "known_item_ids.json").unlink(missing_ok=True)
+    
     def migrate_known_items(self) -> bool:
         """
         迁移已知内容ID数据
@@ -229,15 +265,12 @@ class DouyinMigrator:
                 with open(source_file, 'r', encoding='utf-8') as f:
                     known_items = json.load(f)
                 
-                # 创建目标目录
+                # 写入目标目录（douyin1使用逐行追加的日志格式）
                 safe_name = self._safe_filename(url)
                 target_dir = self.target_data / safe_name
-                target_file = target_dir / "known_item_ids.json"
                 
                 if not self.dry_run:
-                    target_dir.mkdir(parents=True, exist_ok=True)
-                    with open(target_file, 'w', encoding='utf-8') as f:
-                        json.dump(known_items, f, ensure_ascii=False, indent=2)
+                    self._write_target_known_items(target_dir, known_items)
                 
                 migrated_count += 1
                 self.logger.info(f"{'[DRY RUN] ' if self.dry_run else ''}迁移已知内容: {url} ({len(known_items)} 个)")
@@ -324,13 +357,11 @@ class DouyinMigrator:
                     continue
                 
                 safe_name = self._safe_filename(url)
-                target_file = self.target_data / safe_name / "known_item_ids.json"
+                target_items = self._load_target_known_items(self.target_data / safe_name)
                 
-                if target_file.exists():
+                if target_items is not None:
                     with open(source_file, 'r', encoding='utf-8') as f:
                         source_items = json.load(f)
-                    with open(target_file, 'r', encoding='utf-8') as f:
-                        target_items = json.load(f)
                     
                     if source_items == target_items:
                         verified_count += 1
@@ -23,6 +23,9 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set
 from datetime import datetime
 
+# douyin1已知内容ID日志文件名（每行一个ID，与services/douyin1/manager.py保持一致）
+KNOWN_IDS_LOG_FILENAME = "known_item_ids.log"
+
 
 class SafeDouyinMigrator:
     """安全的Douyin数据迁移器"""
@@ -213,6 +216,49 @@ class SafeDouyinMigrator:
             self.logger.error(f"保存JSON文件失败: {file_path}, 错误: {e}")
             return False
     
+    def _load_target_known_items(self, target_dir: Path) -> List[str]:
+        """
+        安全加载douyin1目标目录的已知内容ID（优先读取日志文件，不存在时回退到JSON文件）
+        
+        Args:
+            target_dir: 目标URL目录
+            
+        Returns:
+            List[str]: 已知内容ID列表，如果文件不存在或出错则返回空列表
+        """
+        log_file = target_dir / KNOWN_IDS_LOG_FILENAME
+        try:
+            if log_file.exists():
+                return [line for line in log_file.read_text(encoding='utf-8').splitlines() if line]
+        except Exception as e:
+            self.logger.error(f"加载已知内容日志失败: {log_file}, 错误: {e}")
+            return []
+        
+        known_items = self._load_json_safe(target_dir / "known_item_ids.json")
+        return known_items if isinstance(known_items, list) else []
+    
+    def _save_target_known_items(self, target_dir: Path, known_items: List[str]) -> bool:
+        """
+        以douyin1的日志格式安全保存已知内容ID，并删除旧的JSON文件
+        
+        Args:
+            target_dir: 目标URL目录
+            known_items: 已知内容ID列表
+            
+        Returns:
+            bool: 是否保存成功
+        """
+        log_file = target_dir / KNOWN_IDS_LOG_FILENAME
+        try:
+            if not self.dry_run:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                log_file.write_text(''.join(f"{item_id}\n" for item_id in known_items), encoding='utf-8')
+                (target_dir / "known_item_ids.json").unlink(missing_ok=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"保存已知内容日志失败: {log_file}, 错误: {e}")
+            return False
+    
     def create_target_backup(self) -> bool:
         """
         创建目标数据备份（douyin1现有数据）
@@ -343,12 +389,9 @@ class SafeDouyinMigrator:
                 # 确定目标文件路径
                 safe_name = self._safe_filename(url)
                 target_dir = self.target_data / safe_name
-                target_file = target_dir / "known_item_ids.json"
                 
-                # 加载目标数据
-                target_items = self._load_json_safe(target_file)
-                if not isinstance(target_items, list):
-                    target_items = []
+                # 加载目标数据（douyin1可能已将已知内容迁移为日志格式）
+                target_items = self._load_target_known_items(target_dir)
                 
                 # 合并已知内容（去重）
                 source_set = set(source_items)
@@ -365,11 +408,8 @@ class SafeDouyinMigrator:
                     if item not in target_set:
                         merged_items.append(item)
                 
-                # 保存合并结果
-                if not self.dry_run:
-                    target_dir.mkdir(parents=True, exist_ok=True)
-                
-                if not self._save_json_safe(merged_items, target_file):
+                # 保存合并结果（douyin1使用逐行追加的日志格式）
+                if not self._save_target_known_items(target_dir, merged_items):
                     continue
                 
                 merged_count += 1
@@ -0,0 +1,68 @@
+"""
+异步日志模块
+
+将根日志记录器的处理器移到后台线程执行，命令处理路径上的日志调用只做入队操作，
+不再同步写入控制台或文件，避免日志I/O阻塞事件循环。
+
+主要功能：
+1. QueueHandler + QueueListener 异步日志（沿用根日志记录器原有的处理器）
+2. 幂等初始化（重复调用只生效一次），应在应用启动时调用
+
+作者: Assistant
+创建时间: 2024年
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_queue_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def setup_async_logging() -> bool:
+    """
+    将根日志记录器切换为异步队列模式
+
+    Returns:
+        bool: 本次调用是否完成了切换（已切换或没有可用处理器时返回False）
+    """
+    global _queue_listener
+
+    with _setup_lock:
+        if _queue_listener is not None:
+            return False
+
+        root_logger = logging.getLogger()
+        handlers = list(root_logger.handlers)
+        if not handlers:
+            # 日志尚未配置，保持原样
+            return False
+
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(QueueHandler(log_queue))
+
+        listener.start()
+        # 进程退出前停止监听线程，确保队列中的日志全部写出
+        atexit.register(listener.stop)
+
+        _queue_listener = listener
+        logging.info("✅ 异步日志已启用，处理器数量: %s", len(handlers))
+        return True
+
+
+def is_async_logging_enabled() -> bool:
+    """
+    检查异步日志是否已启用
+
+    Returns:
+        bool: 是否已启用
+    """
+    return _queue_listener is not None
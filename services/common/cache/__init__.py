@@ -4,6 +4,7 @@
 提供统一的缓存接口，支持多种缓存策略：
 - file: 文件缓存（默认，零依赖）
 - redis: Redis缓存（生产环境推荐）
+- memory: 进程内内存缓存（一级缓存，需显式指定）
 """
 
 from .factory import get_cache
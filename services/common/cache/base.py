@@ -98,6 +98,26 @@ class CacheInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def size(self) -> int:
+        """
+        获取缓存条目数量
+
+        Returns:
+            int: 缓存条目数量
+        """
+        pass
+
+    @property
+    def ttl_seconds(self) -> int:
+        """
+        默认过期时间（秒）
+
+        Returns:
+            int: 默认TTL
+        """
+        return self.default_ttl
+
     def _get_effective_ttl(self, ttl: Optional[int]) -> int:
         """
         获取有效的TTL值
@@ -9,6 +9,7 @@ import logging
 from typing import Optional, Dict, Any
 from .base import CacheInterface
 from .file_cache import FileCache
+from .memory_cache import MemoryCache
 
 # 尝试导入Redis缓存
 try:
@@ -29,7 +30,7 @@ def get_cache(name: str,
 
     Args:
         name: 缓存实例名称
-        cache_type: 缓存类型 ('file', 'redis', None=自动选择)
+        cache_type: 缓存类型 ('file', 'redis', 'memory', None=自动选择)
         ttl: 默认过期时间（秒）
         **kwargs: 缓存特定的配置参数
 
@@ -52,6 +53,8 @@ def get_cache(name: str,
         return _create_file_cache(name, ttl, **kwargs)
     elif cache_type == "redis":
         return _create_redis_cache(name, ttl, **kwargs)
+    elif cache_type == "memory":
+        return _create_memory_cache(name, ttl, **kwargs)
     else:
         raise ValueError(f"不支持的缓存类型: {cache_type}")
 
@@ -119,6 +122,25 @@ def _create_file_cache(name: str, ttl: int, **kwargs) -> FileCache:
     )
 
 
+def _create_memory_cache(name: str, ttl: int, **kwargs) -> MemoryCache:
+    """
+    创建内存缓存实例
+
+    Args:
+        name: 缓存名称
+        ttl: 过期时间
+        **kwargs: 内存缓存配置
+
+    Returns:
+        MemoryCache: 内存缓存实例
+    """
+    return MemoryCache(
+        name=name,
+        ttl=ttl,
+        maxsize=kwargs.get("maxsize", 512)
+    )
+
+
 def _create_redis_cache(name: str, ttl: int, **kwargs) -> RedisCache:
     """
     创建Redis缓存实例
@@ -211,6 +211,14 @@ class FileCache(CacheInterface):
             self.logger.error(f"清空缓存失败: {str(e)}")
             return False
 
+    def size(self) -> int:
+        """获取缓存条目数量（包含尚未清理的过期文件）"""
+        try:
+            return sum(1 for _ in self.cache_dir.glob("*.json"))
+        except OSError as e:
+            self.logger.error(f"统计缓存数量失败: {str(e)}")
+            return 0
+
     def cleanup_expired(self) -> int:
         """清理过期缓存"""
         try:
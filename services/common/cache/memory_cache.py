@@ -0,0 +1,90 @@
+"""
+内存缓存实现
+
+进程内LRU缓存，支持TTL和最大条目数限制
+直接保存Python对象（不做序列化），适合作为Redis/文件缓存前的一级缓存
+零依赖，只使用Python标准库
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from .base import CacheInterface
+
+
+class MemoryCache(CacheInterface):
+    """内存缓存实现"""
+
+    def __init__(self, name: str, ttl: int = 3600, maxsize: int = 512):
+        """
+        初始化内存缓存
+
+        Args:
+            name: 缓存实例名称
+            ttl: 默认过期时间（秒）
+            maxsize: 最大缓存条目数，超出时淘汰最久未使用的条目
+        """
+        super().__init__(name, ttl)
+
+        self.maxsize = maxsize
+        # {键: (过期时间, 值)}，按访问顺序排列
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.logger.info(f"内存缓存初始化完成: {name}, 最大条目数: {maxsize}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """获取缓存值"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() > expires_at:
+                del self._cache[key]
+                self.logger.debug(f"缓存已过期: {key}")
+                return None
+
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """设置缓存值"""
+        effective_ttl = self._get_effective_ttl(ttl)
+        with self._lock:
+            self._cache[key] = (time.monotonic() + effective_ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return True
+
+    def delete(self, key: str) -> bool:
+        """删除缓存"""
+        with self._lock:
+            self._cache.pop(key, None)
+        return True
+
+    def exists(self, key: str) -> bool:
+        """检查缓存是否存在"""
+        return self.get(key) is not None
+
+    def clear(self) -> bool:
+        """清空所有缓存"""
+        with self._lock:
+            self._cache.clear()
+        return True
+
+    def size(self) -> int:
+        """获取缓存条目数量（包含尚未清理的过期条目）"""
+        return len(self._cache)
+
+    def cleanup_expired(self) -> int:
+        """清理过期缓存"""
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [key for key, (expires_at, _) in self._cache.items() if now > expires_at]
+            for key in expired_keys:
+                del self._cache[key]
+        return len(expired_keys)
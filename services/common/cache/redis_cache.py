@@ -240,6 +240,15 @@ class RedisCache(CacheInterface):
             self.logger.error(f"清空缓存失败: {str(e)}")
             return False
 
+    def size(self) -> int:
+        """获取缓存条目数量"""
+        try:
+            pattern = f"{self.key_prefix}*"
+            return sum(1 for _ in self.redis_client.scan_iter(match=pattern))
+        except Exception as e:
+            self.logger.error(f"统计缓存数量失败: {str(e)}")
+            return 0
+
     def cleanup_expired(self) -> int:
         """
         清理过期缓存
@@ -0,0 +1,56 @@
+"""
+JSON序列化工具模块
+
+优先使用orjson直接解析/生成字节数据（省去str与bytes之间的编解码），
+orjson不可用时自动降级为标准库json，接口保持一致。
+
+主要功能：
+1. loads: 解析bytes或str格式的JSON数据
+2. dumps: 序列化为UTF-8编码的bytes（可选2空格缩进）
+
+作者: Assistant
+创建时间: 2024年
+"""
+
+import json
+from typing import Any, Union
+
+# 尝试导入orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    解析JSON数据
+
+    Args:
+        data: JSON数据（bytes或str）
+
+    Returns:
+        Any: 解析后的Python对象
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    序列化为UTF-8编码的JSON字节数据（非ASCII字符不转义）
+
+    Args:
+        obj: 要序列化的对象
+        indent: 是否使用2空格缩进
+
+    Returns:
+        bytes: JSON字节数据
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
@@ -107,140 +107,132 @@ class UnifiedCommandHandler(ABC):
             context: 命令上下文
         """
         try:
-            display_name = self.get_module_display_name()
-
             # 记录命令开始处理
             user = update.message.from_user
             chat_id = update.message.chat_id
-            self.logger.info(f"🚀 开始处理 /{self.module_name}_add 命令 - 用户: {user.username}(ID:{user.id}) 聊天ID: {chat_id}")
+            self.logger.info("🚀 开始处理 /%s_add 命令 - 用户: %s(ID:%s) 聊天ID: %s", self.module_name, user.username, user.id, chat_id)
 
             # 1. 参数验证
-            self.logger.info(f"📝 步骤1: 参数验证 - 参数数量: {len(context.args)}")
+            self.logger.info("📝 步骤1: 参数验证 - 参数数量: %s", len(context.args))
             if len(context.args) < 2:
-                self.logger.warning(f"❌ 参数不足: 需要2个参数，实际收到{len(context.args)}个")
-                await update.message.reply_text(
-                    f"❌ 参数不足\n\n"
-                    f"用法: /{self.module_name}_add <{display_name}链接> <频道ID>\n\n"
-                    f"示例:\n"
-                    f"/{self.module_name}_add https://example.com/feed @my_channel\n"
-                    f"/{self.module_name}_add https://example.com/feed -1001234567890"
-                )
+                self.logger.warning("❌ 参数不足: 需要2个参数，实际收到%s个", len(context.args))
+                await update.message.reply_text(self._format_add_usage_message())
                 return
 
             source_url = context.args[0].strip()
             target_chat_id = context.args[1].strip()
-            self.logger.info(f"📋 解析参数 - 源URL: {source_url}, 目标频道: {target_chat_id}")
+            self.logger.info("📋 解析参数 - 源URL: %s, 目标频道: %s", source_url, target_chat_id)
 
             # 验证频道ID格式
-            self.logger.info(f"🔍 步骤2: 频道ID格式验证")
+            self.logger.info("🔍 步骤2: 频道ID格式验证")
             chat_valid, chat_error = self.validate_chat_id(target_chat_id)
             if not chat_valid:
-                self.logger.error(f"❌ 频道ID验证失败: {chat_error}")
+                self.logger.error("❌ 频道ID验证失败: %s", chat_error)
                 await update.message.reply_text(f"❌ {chat_error}")
                 return
-            self.logger.info(f"✅ 频道ID格式验证通过")
+            self.logger.info("✅ 频道ID格式验证通过")
 
             # 2. 检查订阅状态
-            self.logger.info(f"📊 步骤3: 检查订阅状态")
+            self.logger.info("📊 步骤3: 检查订阅状态")
             subscriptions = self.manager.get_subscriptions()
-            self.logger.info(f"📈 当前订阅统计: {len(subscriptions)} 个源，总频道数: {sum(len(channels) for channels in subscriptions.values())}")
+            self.logger.info("📈 当前订阅统计: %s 个源，总频道数: %s", len(subscriptions), sum(len(channels) for channels in subscriptions.values()))
 
             subscription_status = self._check_subscription_status(source_url, target_chat_id, subscriptions)
-            self.logger.info(f"📋 订阅状态检查结果: {subscription_status}")
+            self.logger.info("📋 订阅状态检查结果: %s", subscription_status)
 
             if subscription_status == "duplicate":
                 # 重复订阅分支 - 直接返回
-                self.logger.info(f"⚠️ 检测到重复订阅，直接返回提示信息")
+                self.logger.info("⚠️ 检测到重复订阅，直接返回提示信息")
                 await update.message.reply_text(self._format_duplicate_subscription_message(source_url, target_chat_id))
                 return
 
             # 3. 立即反馈（非重复订阅才需要处理反馈）
-            self.logger.info(f"💬 步骤4: 发送处理中反馈消息")
+            self.logger.info("💬 步骤4: 发送处理中反馈消息")
             processing_message = await update.message.reply_text(self._format_processing_message(source_url, target_chat_id))
-            self.logger.info(f"✅ 处理中消息已发送，消息ID: {processing_message.message_id}")
+            self.logger.info("✅ 处理中消息已发送，消息ID: %s", processing_message.message_id)
 
             # 4. 统一处理流程（首个频道和后续频道使用相同的用户反馈）
             try:
                 if subscription_status == "first_channel":
                     # 首个频道：获取历史内容
-                    self.logger.info(f"🆕 步骤5a: 首个频道订阅流程")
+                    self.logger.info("🆕 步骤5a: 首个频道订阅流程")
                     success, error_msg, content_info = await self._add_first_channel_subscription(source_url, target_chat_id)
                     if not success:
-                        self.logger.error(f"❌ 首个频道订阅失败: {error_msg}")
+                        self.logger.error("❌ 首个频道订阅失败: %s", error_msg)
                         await processing_message.edit_text(self._format_error_message(source_url, error_msg))
                         return
-                    self.logger.info(f"✅ 首个频道订阅添加成功")
+                    self.logger.info("✅ 首个频道订阅添加成功")
 
-                    self.logger.info(f"📥 步骤6a: 获取历史内容")
+                    self.logger.info("📥 步骤6a: 获取历史内容")
                     check_success, check_error_msg, content_list = self.manager.check_updates(source_url)
                     if not check_success:
-                        self.logger.error(f"❌ 获取历史内容失败: {check_error_msg}")
+                        self.logger.error("❌ 获取历史内容失败: %s", check_error_msg)
                         await processing_message.edit_text(self._format_final_success_message(source_url, target_chat_id, 0))
                         return
 
                     if not content_list:
-                        self.logger.info(f"📭 历史内容为空，完成订阅")
+                        self.logger.info("📭 历史内容为空，完成订阅")
                         await processing_message.edit_text(self._format_final_success_message(source_url, target_chat_id, 0))
                         return
 
                     content_count = len(content_list)
-                    self.logger.info(f"📊 获取到历史内容: {content_count} 个条目")
+                    self.logger.info("📊 获取到历史内容: %s 个条目", content_count)
                 else:
                     # 后续频道：获取已知内容ID列表
-                    self.logger.info(f"➕ 步骤5b: 后续频道订阅流程")
+                    self.logger.info("➕ 步骤5b: 后续频道订阅流程")
                     success, error_msg, content_info = await self._add_additional_channel_subscription(source_url, target_chat_id)
                     if not success:
-                        self.logger.error(f"❌ 后续频道订阅失败: {error_msg}")
+                        self.logger.error("❌ 后续频道订阅失败: %s", error_msg)
                         await processing_message.edit_text(self._format_error_message(source_url, error_msg))
                         return
-                    self.logger.info(f"✅ 后续频道订阅添加成功")
+                    self.logger.info("✅ 后续频道订阅添加成功")
 
                     if isinstance(content_info, dict) and content_info.get("need_alignment"):
                         content_list = content_info.get("known_item_ids", [])
                         content_count = len(content_list)
-                        self.logger.info(f"🔄 需要历史对齐: {content_count} 个已知条目")
+                        self.logger.info("🔄 需要历史对齐: %s 个已知条目", content_count)
                     else:
                         content_count = 0
-                        self.logger.info(f"📭 无需历史对齐")
+                        self.logger.info("📭 无需历史对齐")
 
                 # 5. 进度反馈（统一格式）
                 if content_count > 0:
-                    self.logger.info(f"📈 步骤7: 更新进度反馈 - 内容数量: {content_count}")
+                    self.logger.info("📈 步骤7: 更新进度反馈 - 内容数量: %s", content_count)
                     await processing_message.edit_text(self._format_progress_message(source_url, target_chat_id, content_count))
 
                     # 6. 执行具体操作（用户无感知差异）
                     if subscription_status == "first_channel":
                         # 发送到频道
-                        self.logger.info(f"📤 步骤8a: 开始批量发送内容到频道")
+                        self.logger.info("📤 步骤8a: 开始批量发送内容到频道")
                         sent_count = await self.manager.send_content_batch(
                             context.bot, content_list, source_url, [target_chat_id]
                         )
-                        self.logger.info(f"✅ 批量发送完成: 成功发送 {sent_count}/{content_count} 个内容")
+                        self.logger.info("✅ 批量发送完成: 成功发送 %s/%s 个内容", sent_count, content_count)
                     else:
                         # 历史对齐（用户看不到技术细节）
-                        self.logger.info(f"🔄 步骤8b: 开始历史对齐")
+                        self.logger.info("🔄 步骤8b: 开始历史对齐")
                         alignment_success, alignment_msg, sent_count = await self.alignment.perform_historical_alignment(
                             context.bot, source_url, target_chat_id, self.manager, content_list
                         )
-                        self.logger.info(f"✅ 历史对齐完成: {'成功' if alignment_success else '失败'}, 对齐条目: {sent_count}, 消息: {alignment_msg}")
+                        self.logger.info("✅ 历史对齐完成: %s, 对齐条目: %s, 消息: %s", '成功' if alignment_success else '失败', sent_count, alignment_msg)
 
                     # 7. 最终反馈（统一格式）
-                    self.logger.info(f"🎉 步骤9: 发送最终成功反馈")
+                    self.logger.info("🎉 步骤9: 发送最终成功反馈")
                     await processing_message.edit_text(self._format_final_success_message(source_url, target_chat_id, sent_count))
                 else:
                     # 无内容的情况
-                    self.logger.info(f"📭 步骤9: 无内容，发送成功反馈")
+                    self.logger.info("📭 步骤9: 无内容，发送成功反馈")
                     await processing_message.edit_text(self._format_final_success_message(source_url, target_chat_id, 0))
 
-                self.logger.info(f"🎊 /{self.module_name}_add 命令处理完成 - 源: {source_url}, 频道: {target_chat_id}")
+                self.logger.info("🎊 /%s_add 命令处理完成 - 源: %s, 频道: %s", self.module_name, source_url, target_chat_id)
 
             except Exception as e:
                 # 错误反馈
-                self.logger.error(f"💥 订阅处理失败: {source_url} -> {target_chat_id}", exc_info=True)
+                self.logger.error("💥 订阅处理失败: %s -> %s", source_url, target_chat_id, exc_info=True)
                 await processing_message.edit_text(self._format_error_message(source_url, str(e)))
 
         except Exception as e:
-            self.logger.error(f"💥 处理{self.get_module_display_name()}添加命令失败", exc_info=True)
+            self.logger.error("💥 处理%s添加命令失败", self.get_module_display_name(), exc_info=True)
             await update.message.reply_text(f"❌ 处理命令时发生错误: {str(e)}")
 
     async def handle_remove_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -513,6 +505,18 @@ class UnifiedCommandHandler(ABC):
 
     # ==================== 消息格式化方法 ====================
 
+    def _format_add_usage_message(self) -> str:
+        """格式化添加命令用法消息（子类可覆盖为预先构建的常量）"""
+        display_name = self.get_module_display_name()
+
+        return (
+            f"❌ 参数不足\n\n"
+            f"用法: /{self.module_name}_add <{display_name}链接> <频道ID>\n\n"
+            f"示例:\n"
+            f"/{self.module_name}_add https://example.com/feed @my_channel\n"
+            f"/{self.module_name}_add https://example.com/feed -1001234567890"
+        )
+
     def _format_duplicate_subscription_message(self, source_url: str, chat_id: str) -> str:
         """格式化重复订阅消息"""
         display_name = self.get_module_display_name()
@@ -22,6 +22,7 @@ import asyncio
 import json
 import hashlib
 import re
+from types import MappingProxyType
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Any, Tuple, Union
 from pathlib import Path
@@ -32,6 +33,7 @@ from .unified_interval_manager import UnifiedIntervalManager
 from .unified_sender import UnifiedTelegramSender
 from .telegram_message import TelegramMessage
 from .message_converter import MessageConverter, get_converter, ConverterType
+from . import json_utils
 
 
 class UnifiedContentManager(ABC):
@@ -57,6 +59,9 @@ class UnifiedContentManager(ABC):
         self.sender = UnifiedTelegramSender()
         self.interval_manager = UnifiedIntervalManager("batch_send")
 
+        # 订阅数据版本号（订阅或最新内容变化时递增，供调用方判断缓存是否失效）
+        self._subscriptions_version = 0
+
         # 初始化数据存储（如果提供了data_dir）
         if data_dir:
             self._init_data_storage(data_dir)
@@ -117,14 +122,25 @@ class UnifiedContentManager(ABC):
         try:
             if self.subscriptions_file.exists():
                 with open(self.subscriptions_file, 'r', encoding='utf-8') as f:
-                    self._subscriptions_cache = json.load(f)
-                self.logger.debug(f"加载订阅数据: {len(self._subscriptions_cache)} 个源")
+                    subscriptions = json.load(f)
+                self.logger.debug(f"加载订阅数据: {len(subscriptions)} 个源")
             else:
-                self._subscriptions_cache = {}
+                subscriptions = {}
                 self.logger.debug("订阅文件不存在，初始化为空")
         except Exception as e:
             self.logger.error(f"加载订阅数据失败: {str(e)}", exc_info=True)
-            self._subscriptions_cache = {}
+            subscriptions = {}
+
+        # 兼容旧格式（单个频道ID字符串），加载时统一转换为频道列表
+        subscriptions = {
+            source_url: [channels] if isinstance(channels, str) else channels
+            for source_url, channels in subscriptions.items()
+        }
+
+        # 调度器每轮都会重新加载，内容未变化时不递增版本号
+        if subscriptions != self._subscriptions_cache:
+            self._subscriptions_version += 1
+        self._subscriptions_cache = subscriptions
 
     def _load_message_mappings(self):
         """加载消息映射数据（通用实现）"""
@@ -142,6 +158,7 @@ class UnifiedContentManager(ABC):
 
     def _save_subscriptions(self):
         """保存订阅数据（通用实现）"""
+        self._subscriptions_version += 1
         try:
             with open(self.subscriptions_file, 'w', encoding='utf-8') as f:
                 json.dump(self._subscriptions_cache, f, ensure_ascii=False, indent=2)
@@ -193,6 +210,33 @@ class UnifiedContentManager(ABC):
             raise NotImplementedError("数据存储未初始化，子类需要实现此方法")
         return self._subscriptions_cache.copy()
 
+    def get_subscriptions_view(self) -> MappingProxyType:
+        """
+        获取订阅信息的只读视图（零拷贝，适用于只需遍历的调用方）
+
+        注意：视图直接反映当前订阅数据，通过视图修改会抛出TypeError；
+        跨await使用时请自行处理订阅数据可能发生的变化。
+
+        Returns:
+            MappingProxyType: {源URL: [频道ID列表]} 的只读视图
+        """
+        if self._subscriptions_cache is None:
+            raise NotImplementedError("数据存储未初始化，子类需要实现此方法")
+        # _load_subscriptions会重新绑定缓存字典，因此每次基于当前字典创建视图
+        return MappingProxyType(self._subscriptions_cache)
+
+    def get_subscriptions_version(self) -> int:
+        """
+        获取订阅数据版本号
+
+        订阅增删、重新加载到不同的订阅数据、保存最新内容时递增，
+        调用方可据此缓存基于订阅数据渲染的结果。
+
+        Returns:
+            int: 当前版本号
+        """
+        return self._subscriptions_version
+
     def get_subscription_channels(self, source_url: str) -> List[str]:
         """
         获取指定源的订阅频道列表（通用实现）
@@ -228,11 +272,10 @@ class UnifiedContentManager(ABC):
             known_items_file = url_dir / "known_item_ids.json"
 
             if known_items_file.exists():
-                with open(known_items_file, 'r', encoding='utf-8') as f:
-                    known_items = json.load(f)
-                    if self._known_items_cache is not None:
-                        self._known_items_cache[source_url] = known_items
-                    return known_items.copy()
+                known_items = json_utils.loads(known_items_file.read_bytes())
+                if self._known_items_cache is not None:
+                    self._known_items_cache[source_url] = known_items
+                return known_items.copy()
 
             # 文件不存在，返回空列表
             if self._known_items_cache is not None:
@@ -262,8 +305,7 @@ class UnifiedContentManager(ABC):
             url_dir.mkdir(parents=True, exist_ok=True)
 
             known_items_file = url_dir / "known_item_ids.json"
-            with open(known_items_file, 'w', encoding='utf-8') as f:
-                json.dump(item_ids, f, ensure_ascii=False, indent=2)
+            known_items_file.write_bytes(json_utils.dumps(item_ids, indent=True))
 
             self.logger.debug(f"保存已知条目ID成功: {source_url}, {len(item_ids)} 个")
 
@@ -752,6 +794,9 @@ class UnifiedContentManager(ABC):
         sorted_items = self._sort_content_by_time(content_items)
         self.logger.info(f"📅 内容按时间排序完成")
 
+        # 转换器在整个批次内不变，只获取一次
+        converter = self._get_module_converter()
+
         for i, content in enumerate(sorted_items):
             # 为当前内容项维护成功记录（内存中）
             successful_channels = {}  # {channel_id: [message_id1, message_id2, ...]}
@@ -780,7 +825,6 @@ class UnifiedContentManager(ABC):
                         self.logger.info(f"📡 尝试发送到频道 {j+1}/{len(target_channels)} {potential_send_channel}: {content.get('title', '无标题')[:30]}{'...' if len(content.get('title', '')) > 30 else ''}")
 
                         # 转换为统一消息格式
-                        converter = self._get_module_converter()
                         if not converter:
                             self.logger.error(f"❌ 无法获取转换器，跳过内容: {content.get('title', '无标题')}")
                             continue
@@ -815,84 +859,8 @@ class UnifiedContentManager(ABC):
                 # 步骤2：向剩余频道转发
                 remaining_channels = [ch for ch in target_channels if ch not in successful_channels]
                 if remaining_channels:
-                    self.logger.info(f"🔄 开始转发到剩余 {len(remaining_channels)} 个频道")
-                    # 初始化转发专用间隔管理器
-                    forward_interval_manager = UnifiedIntervalManager("forward")
-
-                    for channel_index, channel in enumerate(remaining_channels):
-                        success = False
-
-                        # 转发前等待（使用转发专用间隔管理器）
-                        await forward_interval_manager.wait_before_send(
-                            content_index=channel_index,
-                            total_content=len(remaining_channels),
-                            recent_error_rate=forward_interval_manager.get_recent_error_rate()
-                        )
-
-                        # 从所有成功频道中尝试转发（统一处理，不区分发送频道）
-                        for source_channel, source_msg_ids in successful_channels.items():
-                            if source_channel != channel:  # 不从自己转发给自己
-                                try:
-                                    self.logger.info(f"🔄 尝试转发: {source_channel} -> {channel}")
-                                    forwarded_messages = await bot.copy_messages(
-                                        chat_id=channel,
-                                        from_chat_id=source_channel,
-                                        message_ids=source_msg_ids
-                                    )
-                                    # 处理返回的消息（可能是单个消息、消息列表或消息元组）
-                                    if isinstance(forwarded_messages, (list, tuple)):
-                                        forwarded_ids = [msg.message_id for msg in forwarded_messages]
-                                    else:
-                                        forwarded_ids = [forwarded_messages.message_id]
-                                    self.save_message_mapping(source_url, content['item_id'], channel, forwarded_ids)
-                                    successful_channels[channel] = forwarded_ids  # 内存记录
-                                    self.logger.info(f"✅ 转发成功: {source_channel} -> {channel}, 消息ID列表: {forwarded_ids}")
-                                    # 更新转发统计信息（转发成功）
-                                    forward_interval_manager.update_statistics(success=True)
-                                    success = True
-                                    break  # 转发成功，跳出循环
-                                except Exception as forward_error:
-                                    self.logger.debug(f"⚠️ 从 {source_channel} 转发到 {channel} 失败: {forward_error}")
-                                    # 检查是否是Flood Control错误（使用转发专用间隔管理器）
-                                    if "flood control" in str(forward_error).lower():
-                                        await forward_interval_manager.wait_after_error("flood_control")
-                                    elif "rate limit" in str(forward_error).lower():
-                                        await forward_interval_manager.wait_after_error("rate_limit")
-                                    else:
-                                        await forward_interval_manager.wait_after_error("other")
-                                    continue  # 转发失败，尝试下一个源频道
-
-                        # 所有转发都失败，最后降级为直接发送
-                        if not success:
-                            self.logger.warning(f"⚠️ 所有转发都失败，降级发送: {channel}")
-                            try:
-                                # 转换为统一消息格式
-                                converter = self._get_module_converter()
-                                if not converter:
-                                    self.logger.error(f"❌ 无法获取转换器，跳过降级发送: {channel}")
-                                    continue
-
-                                telegram_message = converter.convert(content)
-
-                                # 使用统一发送器发送
-                                fallback_messages = await self.sender.send_message(bot, channel, telegram_message)
-
-                                if fallback_messages:
-                                    fallback_ids = [msg.message_id for msg in fallback_messages]
-                                    self.save_message_mapping(source_url, content['item_id'], channel, fallback_ids)
-                                    successful_channels[channel] = fallback_ids  # 内存记录
-                                    self.logger.info(f"✅ 降级发送成功: {channel}")
-                                    # 更新转发统计信息（降级发送成功）
-                                    forward_interval_manager.update_statistics(success=True)
-                            except Exception as send_error:
-                                self.logger.error(f"❌ 降级发送也失败: {channel}, 错误: {send_error}", exc_info=True)
-                                # 更新转发统计信息（降级发送失败）
-                                forward_interval_manager.update_statistics(success=False)
-                                continue
-
-                    # 输出转发统计摘要（如果有转发操作）
-                    if remaining_channels:
-                        self.logger.info(f"📊 转发统计: {forward_interval_manager.get_statistics_summary()}")
+                    await self._forward_to_remaining_channels(bot, content, source_url, remaining_channels,
+                                                              successful_channels, converter)
 
                 # 步骤3：标记内容已发送
                 self.mark_item_as_sent(source_url, content)
@@ -917,6 +885,124 @@ class UnifiedContentManager(ABC):
         self.logger.info(f"📊 {self.interval_manager.get_statistics_summary()}")
         return sent_count
 
+    async def _forward_to_remaining_channels(self, bot: Bot, content: Dict, source_url: str,
+                                             remaining_channels: List[str],
+                                             successful_channels: Dict[str, List[int]], converter) -> None:
+        """
+        将已发送成功的内容逐个转发到剩余频道（按转发间隔依次处理）
+
+        Args:
+            bot: Telegram Bot实例
+            content: 内容数据
+            source_url: 数据源URL
+            remaining_channels: 尚未收到内容的频道列表
+            successful_channels: 已成功的频道及其消息ID（转发成功后原地更新）
+            converter: 消息转换器（降级直接发送时使用）
+        """
+        self.logger.info(f"🔄 开始转发到剩余 {len(remaining_channels)} 个频道")
+        # 初始化转发专用间隔管理器
+        forward_interval_manager = UnifiedIntervalManager("forward")
+
+        for channel_index, channel in enumerate(remaining_channels):
+            # 转发前等待（使用转发专用间隔管理器）
+            await forward_interval_manager.wait_before_send(
+                content_index=channel_index,
+                total_content=len(remaining_channels),
+                recent_error_rate=forward_interval_manager.get_recent_error_rate()
+            )
+            await self._forward_to_channel(bot, content, source_url, channel, successful_channels,
+                                           forward_interval_manager, converter)
+
+        # 输出转发统计摘要
+        self.logger.info(f"📊 转发统计: {forward_interval_manager.get_statistics_summary()}")
+
+    async def _forward_to_channel(self, bot: Bot, content: Dict, source_url: str, channel: str,
+                                  successful_channels: Dict[str, List[int]],
+                                  forward_interval_manager: UnifiedIntervalManager, converter,
+                                  source_channels: Optional[List[Tuple[str, List[int]]]] = None) -> bool:
+        """
+        将内容转发到单个频道（依次尝试从已成功频道复制，全部失败时降级为直接发送）
+
+        Args:
+            bot: Telegram Bot实例
+            content: 内容数据
+            source_url: 数据源URL
+            channel: 目标频道
+            successful_channels: 已成功的频道及其消息ID（转发成功后原地更新）
+            forward_interval_manager: 转发专用间隔管理器
+            converter: 消息转换器
+            source_channels: 可作为转发来源的(频道, 消息ID列表)，默认使用当前所有成功频道
+
+        Returns:
+            bool: 目标频道是否已收到内容
+        """
+        success = False
+
+        if source_channels is None:
+            source_channels = list(successful_channels.items())
+
+        # 从所有成功频道中尝试转发（统一处理，不区分发送频道）
+        for source_channel, source_msg_ids in source_channels:
+            if source_channel != channel:  # 不从自己转发给自己
+                try:
+                    self.logger.info(f"🔄 尝试转发: {source_channel} -> {channel}")
+                    forwarded_messages = await bot.copy_messages(
+                        chat_id=channel,
+                        from_chat_id=source_channel,
+                        message_ids=source_msg_ids
+                    )
+                    # 处理返回的消息（可能是单个消息、消息列表或消息元组）
+                    if isinstance(forwarded_messages, (list, tuple)):
+                        forwarded_ids = [msg.message_id for msg in forwarded_messages]
+                    else:
+                        forwarded_ids = [forwarded_messages.message_id]
+                    self.save_message_mapping(source_url, content['item_id'], channel, forwarded_ids)
+                    successful_channels[channel] = forwarded_ids  # 内存记录
+                    self.logger.info(f"✅ 转发成功: {source_channel} -> {channel}, 消息ID列表: {forwarded_ids}")
+                    # 更新转发统计信息（转发成功）
+                    forward_interval_manager.update_statistics(success=True)
+                    success = True
+                    break  # 转发成功，跳出循环
+                except Exception as forward_error:
+                    self.logger.debug(f"⚠️ 从 {source_channel} 转发到 {channel} 失败: {forward_error}")
+                    # 检查是否是Flood Control错误（使用转发专用间隔管理器）
+                    if "flood control" in str(forward_error).lower():
+                        await forward_interval_manager.wait_after_error("flood_control")
+                    elif "rate limit" in str(forward_error).lower():
+                        await forward_interval_manager.wait_after_error("rate_limit")
+                    else:
+                        await forward_interval_manager.wait_after_error("other")
+                    continue  # 转发失败，尝试下一个源频道
+
+        # 所有转发都失败，最后降级为直接发送
+        if not success:
+            self.logger.warning(f"⚠️ 所有转发都失败，降级发送: {channel}")
+            try:
+                # 转换为统一消息格式
+                if not converter:
+                    self.logger.error(f"❌ 无法获取转换器，跳过降级发送: {channel}")
+                    return False
+
+                telegram_message = converter.convert(content)
+
+                # 使用统一发送器发送
+                fallback_messages = await self.sender.send_message(bot, channel, telegram_message)
+
+                if fallback_messages:
+                    fallback_ids = [msg.message_id for msg in fallback_messages]
+                    self.save_message_mapping(source_url, content['item_id'], channel, fallback_ids)
+                    successful_channels[channel] = fallback_ids  # 内存记录
+                    self.logger.info(f"✅ 降级发送成功: {channel}")
+                    # 更新转发统计信息（降级发送成功）
+                    forward_interval_manager.update_statistics(success=True)
+            except Exception as send_error:
+                self.logger.error(f"❌ 降级发送也失败: {channel}, 错误: {send_error}", exc_info=True)
+                # 更新转发统计信息（降级发送失败）
+                forward_interval_manager.update_statistics(success=False)
+                return False
+
+        return channel in successful_channels
+
     def _sort_content_by_time(self, content_items: List[Dict]) -> List[Dict]:
         """
         按时间排序内容（从旧到新）
@@ -994,6 +1080,8 @@ class UnifiedContentManager(ABC):
                 json.dumps(latest_content_info, indent=2, ensure_ascii=False, default=self.datetime_handler),
                 encoding='utf-8'
             )
+            # 最新内容决定订阅的显示名称（作者），同样视为订阅数据变化
+            self._subscriptions_version += 1
             self.logger.debug(f"✅ 保存最新内容引用成功: {latest_file}")
         except Exception as e:
             self.logger.error(f"💥 保存最新内容引用失败: {source_url}, 错误: {str(e)}", exc_info=True)
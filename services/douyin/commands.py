@@ -16,23 +16,21 @@ from .sender import send_douyin_content
 from .alignment import perform_historical_alignment
 
 
+# 支持的抖音域名开头
+_VALID_DOUYIN_PREFIXES = (
+    'https://www.douyin.com/',
+    'http://www.douyin.com/',
+    'https://v.douyin.com/',
+    'http://v.douyin.com/',
+)
+
+
 def validate_douyin_url(url: str) -> bool:
     """验证抖音URL格式 - 简单域名匹配"""
     if not url:
         return False
 
-    # 支持的抖音域名开头
-    valid_domains = [
-        'https://www.douyin.com/',
-        'http://www.douyin.com/',
-        'https://v.douyin.com/',
-        'http://v.douyin.com/',
-    ]
-
-    for domain in valid_domains:
-        if url.startswith(domain):
-            return True
-    return False
+    return url.startswith(_VALID_DOUYIN_PREFIXES)
 
 
 # 全局实例
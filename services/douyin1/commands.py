@@ -15,15 +15,46 @@
 
 import logging
 import asyncio
-from typing import Dict, List, Tuple, Optional
-from urllib.parse import urlparse
-from telegram import Update, Bot
+import functools
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Tuple, Optional
+from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler, Application
 
 from services.common.unified_commands import UnifiedCommandHandler
+from services.common import json_utils
 from .manager import create_content_manager
 from . import MODULE_NAME, MODULE_DISPLAY_NAME, DATA_DIR_PREFIX, get_command_names
 
+# 尝试导入aiofiles（用于异步读取latest.json）
+try:
+    import aiofiles
+    import aiofiles.os
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
+# 无法获取作者信息时的默认显示名称
+DEFAULT_SOURCE_DISPLAY_NAME = "抖音链接"
+
+# 添加命令用法消息（模块加载时构建一次）
+_ADD_USAGE = (
+    f"❌ 参数不足\n\n"
+    f"用法: /{MODULE_NAME}_add <抖音链接> <频道ID>\n\n"
+    f"示例:\n"
+    f"/{MODULE_NAME}_add https://v.douyin.com/iM5g7LsM/ @my_channel\n"
+    f"/{MODULE_NAME}_add https://www.douyin.com/user/MS4wLjABAAAA... -1001234567890"
+)
+
+# 订阅列表为空时的提示消息（Markdown）
+_EMPTY_LIST_MSG = (
+    f"*{MODULE_DISPLAY_NAME}订阅列表*\n\n"
+    f"当前没有{MODULE_DISPLAY_NAME}订阅\n\n"
+    f"使用 `/{MODULE_NAME}_add <抖音链接> <频道ID>` 添加订阅"
+)
+
 
 class ModuleCommandHandler(UnifiedCommandHandler):
     """
@@ -48,6 +79,19 @@ class ModuleCommandHandler(UnifiedCommandHandler):
         # 调用父类构造函数
         super().__init__(module_name=MODULE_NAME, manager=content_manager)
 
+        # 预编译命令格式化正则（匹配 /模块名_命令名）
+        self._cmd_re = re.compile(rf'/({MODULE_NAME}_\w+)')
+
+        # 缓存 URL -> 存储目录名 的映射，避免每次列表命令重复计算哈希
+        self._url_hash = functools.lru_cache(maxsize=4096)(self.manager._safe_filename)
+
+        # 缓存渲染后的订阅列表正文: ((订阅数据版本号, 各源latest.json修改时间), 正文)
+        self._rendered_list: Optional[Tuple[Tuple[int, Tuple[int, ...]], str]] = None
+
+        # 缓存列表命令中的基础命令帮助段落（帮助提供者在模块导入时注册）
+        self._help_section: Optional[str] = None
+        self.refresh_help()
+
         self.logger.info(f"{MODULE_DISPLAY_NAME}命令处理器初始化完成")
 
     # ==================== 重写UnifiedCommandHandler的方法 ====================
@@ -73,39 +117,170 @@ class ModuleCommandHandler(UnifiedCommandHandler):
         """
         try:
             # 尝试从latest.json获取作者信息
-            from pathlib import Path
-            import json
-
-            # 使用 UnifiedContentManager 的正确路径结构
-            url_hash = self.manager._safe_filename(source_url)
-            url_dir = self.manager.data_storage_dir / url_hash
-            latest_file = url_dir / "latest.json"
+            latest_file = self._get_latest_file(source_url)
 
             if latest_file.exists():
-                latest_data = json.loads(latest_file.read_text(encoding='utf-8'))
-
-                # 根据实际JSON结构获取作者信息
-                # 作者信息在 author 对象中
-                if "author" in latest_data and isinstance(latest_data["author"], dict):
-                    author_info = latest_data["author"]
-                    # 优先使用 nickname
-                    if author_info.get("nickname"):
-                        return author_info["nickname"]
-                    # 其次使用 uid 作为备选
-                    elif author_info.get("uid"):
-                        return f"用户_{author_info['uid']}"
-
-                # 兼容旧格式：直接在根级别的 nickname 或 author
-                if latest_data.get("nickname"):
-                    return latest_data["nickname"]
-                elif latest_data.get("author"):
-                    return latest_data["author"]
+                latest_data = json_utils.loads(latest_file.read_bytes())
+                author_name = self._extract_author_name(latest_data)
+                if author_name:
+                    return author_name
 
         except Exception as e:
             self.logger.warning(f"获取作者信息失败: {e}")
 
         # 默认返回"抖音链接"
-        return "抖音链接"
+        return DEFAULT_SOURCE_DISPLAY_NAME
+
+    async def _load_author(self, source_url: str) -> str:
+        """
+        异步获取数据源的显示名称（不阻塞事件循环）
+
+        Args:
+            source_url: 链接
+
+        Returns:
+            str: 显示名称
+        """
+        # aiofiles不可用时降级为同步读取
+        if not AIOFILES_AVAILABLE:
+            return self.get_source_display_name(source_url)
+
+        try:
+            latest_file = self._get_latest_file(source_url)
+
+            if await aiofiles.os.path.exists(latest_file):
+                async with aiofiles.open(latest_file, 'rb') as f:
+                    latest_data = json_utils.loads(await f.read())
+                author_name = self._extract_author_name(latest_data)
+                if author_name:
+                    return author_name
+
+        except Exception as e:
+            self.logger.warning(f"获取作者信息失败: {e}")
+
+        return DEFAULT_SOURCE_DISPLAY_NAME
+
+    def _get_latest_file(self, source_url: str) -> Path:
+        """
+        获取数据源的latest.json路径
+
+        Args:
+            source_url: 链接
+
+        Returns:
+            Path: latest.json文件路径
+        """
+        # 使用 UnifiedContentManager 的正确路径结构
+        url_hash = self._url_hash(source_url)
+        return self.manager.data_storage_dir / url_hash / "latest.json"
+
+    def _extract_author_name(self, latest_data: Dict) -> Optional[str]:
+        """
+        从latest.json数据中提取作者名称
+
+        Args:
+            latest_data: latest.json内容
+
+        Returns:
+            Optional[str]: 作者名称，无法提取时返回None
+        """
+        # 根据实际JSON结构获取作者信息
+        # 作者信息在 author 对象中
+        if "author" in latest_data and isinstance(latest_data["author"], dict):
+            author_info = latest_data["author"]
+            # 优先使用 nickname
+            if author_info.get("nickname"):
+                return author_info["nickname"]
+            # 其次使用 uid 作为备选
+            elif author_info.get("uid"):
+                return f"用户_{author_info['uid']}"
+
+        # 兼容旧格式：直接在根级别的 nickname 或 author
+        if latest_data.get("nickname"):
+            return latest_data["nickname"]
+        elif latest_data.get("author"):
+            return latest_data["author"]
+
+        return None
+
+    def refresh_help(self) -> Optional[str]:
+        """
+        重新获取并缓存列表命令中的基础命令帮助段落
+
+        帮助信息提供者在启动后动态注册时调用此方法刷新缓存。
+
+        Returns:
+            Optional[str]: 格式化后的帮助段落，获取失败时返回None
+        """
+        try:
+            from services.common.help_manager import get_help_manager
+            provider = get_help_manager().providers.get(self.module_name)
+
+            if provider is None:
+                self.logger.warning("未找到%s模块的帮助信息提供者", self.module_name)
+                return None
+
+            # 格式化命令，将下划线命令用代码块包围
+            formatted_commands = self._cmd_re.sub(r'`/\1`', provider.get_basic_commands())
+            self._help_section = f"\n*基础命令：*\n{formatted_commands}"
+        except Exception as e:
+            self.logger.warning("获取帮助信息失败: %s", str(e))
+            return None
+
+        return self._help_section
+
+    async def _render_subscription_list(self, subscriptions) -> str:
+        """
+        渲染订阅列表正文（Markdown，不含基础命令段落）
+
+        Args:
+            subscriptions: {源URL: [频道ID列表]} 映射
+
+        Returns:
+            str: 订阅列表正文
+        """
+        # 并发获取作者信息用于锚文本（避免逐个读取latest.json阻塞事件循环）
+        source_urls = tuple(subscriptions)
+        loaded_names = await asyncio.gather(*(self._load_author(source_url) for source_url in source_urls))
+        author_names = dict(zip(source_urls, loaded_names))
+
+        # 使用锚文本格式，生成器直接交给join一次拼接
+        return '\n'.join((
+            f"*{self.get_module_display_name()}订阅列表*\n",
+            *(
+                # await期间新增的订阅没有预取作者信息，使用默认显示名称
+                f"[{author_names.get(source_url, DEFAULT_SOURCE_DISPLAY_NAME)}]({source_url}) → "
+                f"{' | '.join(f'`{channel}`' for channel in target_channels)}"
+                for source_url, target_channels in subscriptions.items()
+            ),
+        ))
+
+    def _latest_mtimes(self, subscriptions) -> Tuple[int, ...]:
+        """
+        获取各订阅源latest.json的修改时间（不存在时为0）
+
+        Args:
+            subscriptions: {源URL: [频道ID列表]} 映射
+
+        Returns:
+            Tuple[int, ...]: 按订阅顺序排列的修改时间（纳秒）
+        """
+        mtimes = []
+        for source_url in subscriptions:
+            try:
+                mtimes.append(self._get_latest_file(source_url).stat().st_mtime_ns)
+            except OSError:
+                mtimes.append(0)
+        return tuple(mtimes)
+
+    def _format_add_usage_message(self) -> str:
+        """
+        格式化添加命令用法消息（返回模块级常量，避免每次调用重新拼接）
+
+        Returns:
+            str: 用法消息
+        """
+        return _ADD_USAGE
 
     async def handle_list_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
@@ -118,69 +293,43 @@ class ModuleCommandHandler(UnifiedCommandHandler):
         try:
             user = update.message.from_user
             chat_id = update.message.chat_id
-            self.logger.info(f"收到{self.module_name.upper()}_LIST命令 - 用户: {user.username}(ID:{user.id}) 聊天ID: {chat_id}")
+            self.logger.info("收到%s_LIST命令 - 用户: %s(ID:%s) 聊天ID: %s", self.module_name.upper(), user.username, user.id, chat_id)
 
-            # 获取所有订阅
-            subscriptions = self.manager.get_subscriptions()
+            # 获取所有订阅（只读视图，列表命令只遍历不修改）
+            subscriptions = self.manager.get_subscriptions_view()
 
             if not subscriptions:
-                self.logger.info(f"{self.module_name}订阅列表为空")
-                await update.message.reply_text(
-                    f"*{self.get_module_display_name()}订阅列表*\n\n"
-                    f"当前没有{self.get_module_display_name()}订阅\n\n"
-                    f"使用 `/{self.module_name}_add <抖音链接> <频道ID>` 添加订阅",
-                    parse_mode='Markdown'
-                )
+                self.logger.info("%s订阅列表为空", self.module_name)
+                await update.message.reply_text(_EMPTY_LIST_MSG, parse_mode='Markdown')
                 return
 
-            # 构建订阅列表内容
-            message_lines = [f"*{self.get_module_display_name()}订阅列表*\n"]
+            # 订阅列表正文按（订阅数据版本号, 各源latest.json修改时间）缓存，均未变化时直接复用
+            # latest.json由调度器的管理器实例写入，其版本号变化不会反映到本处理器的管理器上
+            cache_key = (self.manager.get_subscriptions_version(), self._latest_mtimes(subscriptions))
+            rendered = self._rendered_list
+            if rendered is not None and rendered[0] == cache_key:
+                body = rendered[1]
+            else:
+                body = await self._render_subscription_list(subscriptions)
+                # 使用渲染前的缓存键，渲染期间发生变化时下次会重新渲染
+                self._rendered_list = (cache_key, body)
 
-            for source_url, target_channels in subscriptions.items():
-                # 处理频道列表
-                if isinstance(target_channels, list):
-                    channels_display = ' | '.join([f'`{channel}`' for channel in target_channels])
-                else:
-                    # 兼容旧格式
-                    channels_display = f'`{target_channels}`'
-
-                # 获取作者信息用于锚文本
-                author_name = self.get_source_display_name(source_url)
-
-                # 添加订阅项：使用锚文本格式
-                message_lines.append(f"[{author_name}]({source_url}) → {channels_display}")
-
-            # 添加基础命令
-            try:
-                from services.common.help_manager import get_help_manager
-                help_manager = get_help_manager()
-
-                if self.module_name in help_manager.providers:
-                    provider = help_manager.providers[self.module_name]
-                    basic_commands = provider.get_basic_commands()
-
-                    message_lines.append("\n*基础命令：*")
-                    # 格式化命令，将下划线命令用代码块包围
-                    import re
-                    formatted_commands = re.sub(rf'/({self.module_name}_\w+)', r'`/\1`', basic_commands)
-                    message_lines.append(formatted_commands)
-                else:
-                    self.logger.warning(f"未找到{self.module_name}模块的帮助信息提供者")
-            except Exception as e:
-                self.logger.warning(f"获取帮助信息失败: {str(e)}")
+            # 添加基础命令（使用缓存的帮助段落，未命中时重新获取）
+            help_section = self._help_section or self.refresh_help()
 
             # 发送消息
-            message_text = '\n'.join(message_lines)
-            self.logger.info(f"发送{self.module_name}订阅列表，共{len(subscriptions)}个订阅")
+            message_text = '\n'.join((body, help_section)) if help_section else body
+            self.logger.info("发送%s订阅列表，共%s个订阅", self.module_name, len(subscriptions))
             await update.message.reply_text(message_text, parse_mode='Markdown')
 
         except Exception as e:
-            self.logger.error(f"处理{self.module_name}_list命令失败: {str(e)}", exc_info=True)
+            self.logger.error("处理%s_list命令失败: %s", self.module_name, str(e), exc_info=True)
             await update.message.reply_text(f"❌ 获取订阅列表失败: {str(e)}")
 
 
 # 全局实例
 _command_handler = None
+_handler_lock = threading.Lock()
 
 
 def get_command_handler(data_dir: str = None) -> ModuleCommandHandler:
@@ -194,47 +343,16 @@ def get_command_handler(data_dir: str = None) -> ModuleCommandHandler:
         ModuleCommandHandler: 命令处理器实例
     """
     global _command_handler
-    if _command_handler is None:
-        _command_handler = ModuleCommandHandler(data_dir)
-    return _command_handler
-
-
-# ==================== 通用命令处理函数 ====================
-
-async def handle_add_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """
-    处理添加订阅命令（动态生成）
-
-    Args:
-        update: Telegram更新对象
-        context: 命令上下文
-    """
-    handler = get_command_handler()
-    await handler.handle_add_command(update, context)
-
-
-async def handle_del_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """
-    处理删除订阅命令（动态生成）
-
-    Args:
-        update: Telegram更新对象
-        context: 命令上下文
-    """
-    handler = get_command_handler()
-    await handler.handle_remove_command(update, context)
-
-
-async def handle_list_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """
-    处理列表订阅命令（动态生成）
-
-    Args:
-        update: Telegram更新对象
-        context: 命令上下文
-    """
-    handler = get_command_handler()
-    await handler.handle_list_command(update, context)
+    # 快速路径：已初始化时无需加锁
+    handler = _command_handler
+    if handler is None:
+        with _handler_lock:
+            # 双重检查，避免并发时重复创建处理器
+            handler = _command_handler
+            if handler is None:
+                handler = ModuleCommandHandler(data_dir)
+                _command_handler = handler
+    return handler
 
 
 def register_commands(application: Application) -> None:
@@ -250,10 +368,13 @@ def register_commands(application: Application) -> None:
     # 导入debug配置
     from core.config import debug_config
 
-    # 注册基础命令（使用动态生成的命令名称）
-    application.add_handler(CommandHandler(command_names["add"], handle_add_command))
-    application.add_handler(CommandHandler(command_names["del"], handle_del_command))
-    application.add_handler(CommandHandler(command_names["list"], handle_list_command))
+    # 注册基础命令（使用动态生成的命令名称，直接绑定处理器方法）
+    handler = get_command_handler()
+    application.add_handlers([
+        CommandHandler(command_names["add"], handler.handle_add_command),
+        CommandHandler(command_names["del"], handler.handle_remove_command),
+        CommandHandler(command_names["list"], handler.handle_list_command),
+    ])
 
     # 根据debug模式决定是否注册调试命令
     if debug_config["enabled"]:
@@ -265,4 +386,11 @@ def register_commands(application: Application) -> None:
         logging.info(f"ℹ️ {MODULE_DISPLAY_NAME}调试命令已跳过（DEBUG模式关闭）")
 
     logging.info(f"{MODULE_DISPLAY_NAME}命令处理器注册完成")
-    logging.info(f"📋 已注册命令: {', '.join([f'/{name}' for name in command_names.values()])}")
\ No newline at end of file
+    logging.info(f"📋 已注册命令: {', '.join([f'/{name}' for name in command_names.values()])}")
+
+
+# ==================== 向后兼容别名 ====================
+
+Douyin1CommandHandler = ModuleCommandHandler
+register_douyin1_commands = register_commands
+get_douyin1_command_handler = get_command_handler
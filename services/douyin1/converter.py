@@ -15,14 +15,128 @@
 创建时间: 2024年
 """
 
+import dataclasses
+import functools
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-from urllib.parse import urlparse
-
+import math
+import re
+import time
+from collections import OrderedDict
+from numbers import Real
+from typing import Dict, Any, Optional, List, Tuple
+
+from services.common import json_utils
 from services.common.message_converter import MessageConverter, ConverterType, ConversionError
 from services.common.telegram_message import TelegramMessage, MediaItem, MediaType
 
+# 创建Markdown文本消息（直接调用构造函数，固定参数预先绑定）
+_new_markdown_message = functools.partial(TelegramMessage, parse_mode="Markdown", disable_web_page_preview=False)
+
+# 无法提取任何信息时的降级消息文本
+# TelegramMessage是可变对象，每次仍返回新实例，只复用文本常量
+_GENERIC_FAILURE_TEXT = "🎵 **抖音视频**\n\n⚠️ 内容解析失败"
+
+# Markdown特殊字符转义表（str.translate单次扫描，短文本上比正则替换更快）
+_MD_ESCAPE_TABLE = str.maketrans({char: '\\' + char for char in '*_`[]()~>#+-=|{}.!'})
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape_markdown_cached(text: str) -> str:
+    """
+    转义Markdown特殊字符（带缓存，同一作者的昵称、音乐等字符串在批量转换中反复出现）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        str: 转义后的文本
+    """
+    return text.translate(_MD_ESCAPE_TABLE)
+
+
+# 提取URL中的网络位置（与urlparse().netloc一致：有 // 时取到下一个 / ? # 之前）
+_NETLOC_RE = re.compile(r'(?:[A-Za-z][A-Za-z0-9+.\-]*:)?//([^/?#]*)')
+
+
+@functools.lru_cache(maxsize=256)
+def _source_display_name(source_url: str) -> str:
+    """
+    获取数据源显示名称（带缓存，订阅URL数量有限且反复出现）
+
+    Args:
+        source_url: 数据源URL
+
+    Returns:
+        str: 显示名称
+    """
+    match = _NETLOC_RE.match(source_url)
+    return f"抖音: {match.group(1) if match else ''}"
+
+
+# 标题和音乐名称的最大显示长度（超出部分截断为...）
+_MAX_TITLE_LENGTH = 80
+_MAX_MUSIC_LENGTH = 35
+
+# 格式化消息文本用到的顶层字段（与_format_video_text中的解包顺序一致）
+_TEXT_FIELDS = ('aweme_id', 'desc', 'caption', 'create_time', 'author', 'statistics', 'music')
+
+# 批量转换进度日志间隔（条）
+_BATCH_PROGRESS_LOG_INTERVAL = 50
+
+# 转换结果缓存：按aweme_id缓存最近转换的消息，最多保留的条目数
+_CONVERT_CACHE_MAXSIZE = 1024
+
+# 转换结果依赖的字段（序列化为字节快照后比较，数据有变化则重新转换）
+_CONVERT_CACHE_FIELDS = _TEXT_FIELDS + ('video',)
+
+# 视频消息文本模板，按形态位掩码索引：统计行(4) | 音乐行(2) | 标签行(1)，标题行始终存在
+_CAPTION_FORMATTERS = (
+    lambda title, stats, music, tag: title,
+    lambda title, stats, music, tag: f"{title}\n\n{tag}",
+    lambda title, stats, music, tag: f"{title}\n\n{music}",
+    lambda title, stats, music, tag: f"{title}\n\n{music}\n\n{tag}",
+    lambda title, stats, music, tag: f"{title}\n\n{stats}",
+    lambda title, stats, music, tag: f"{title}\n\n{stats}\n\n{tag}",
+    lambda title, stats, music, tag: f"{title}\n\n{stats}\n\n{music}",
+    lambda title, stats, music, tag: f"{title}\n\n{stats}\n\n{music}\n\n{tag}",
+)
+
+# 作者标签中需要去除的字符
+_TAG_STRIP_TABLE = str.maketrans('', '', '@#_ ')
+
+# 1000以内计数的字符串形式（预先生成，格式化时直接索引）
+_SMALL_COUNT_STRS = tuple(str(i) for i in range(1000))
+
+# 日期缓存的时间分桶粒度（秒）：所有时区偏移和夏令时切换都对齐15分钟，同一分桶内的本地日期必然相同
+_DATE_BUCKET_SECONDS = 900
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_date_bucket(bucket: int) -> str:
+    """
+    格式化时间分桶对应的本地日期
+
+    Args:
+        bucket: 时间戳除以分桶粒度后的分桶编号
+
+    Returns:
+        str: YYYY-MM-DD格式的日期字符串
+    """
+    return time.strftime('%Y-%m-%d', time.localtime(bucket * _DATE_BUCKET_SECONDS))
+
+
+def _copy_message(message: TelegramMessage) -> TelegramMessage:
+    """
+    复制缓存中的消息（媒体项逐个复制，调用方修改返回值不会影响缓存）
+
+    Args:
+        message: 缓存中的消息
+
+    Returns:
+        TelegramMessage: 消息副本
+    """
+    return dataclasses.replace(message, media_group=[dataclasses.replace(item) for item in message.media_group])
+
 
 class DouyinConverter(MessageConverter):
     """抖音消息转换器"""
@@ -31,6 +145,8 @@ class DouyinConverter(MessageConverter):
         """初始化转换器"""
         super().__init__(ConverterType.DOUYIN)
         self.logger = logging.getLogger("douyin1.converter")
+        # {aweme_id: (依赖字段的JSON字节快照, 消息)}，按使用顺序排列，发送重试和降级发送时直接复用
+        self._convert_cache: "OrderedDict[str, Tuple[bytes, TelegramMessage]]" = OrderedDict()
         self.logger.info("抖音消息转换器初始化完成")
 
     def convert(self, source_data: Any, **kwargs) -> TelegramMessage:
@@ -51,21 +167,33 @@ class DouyinConverter(MessageConverter):
             if not self.validate_source_data(source_data):
                 raise ConversionError("无效的抖音视频数据", source_data, "douyin1")
 
+            # 同一视频数据未变化时直接复用上次的转换结果（返回副本，避免调用方修改缓存）
+            # 快照序列化为字节，调用方之后修改嵌套字典（如video）不会影响缓存比较
+            aweme_id = source_data.get('aweme_id')
+            snapshot = json_utils.dumps(tuple(map(source_data.get, _CONVERT_CACHE_FIELDS))) if aweme_id else None
+            cached = self._convert_cache.get(aweme_id) if aweme_id else None
+            if cached is not None and cached[0] == snapshot:
+                self._convert_cache.move_to_end(aweme_id)
+                return _copy_message(cached[1])
+
             # 格式化文本内容
             text_content = self._format_video_text(source_data)
 
             # 创建消息对象
-            message = TelegramMessage.create_text_message(
-                text=text_content,
-                parse_mode="Markdown",
-                disable_web_page_preview=False
-            )
+            message = _new_markdown_message(text_content)
 
             # 添加视频媒体项
             video_item = self._extract_video_media(source_data)
             if video_item:
                 message.add_media(video_item)
 
+            if aweme_id:
+                self._convert_cache[aweme_id] = (snapshot, message)
+                self._convert_cache.move_to_end(aweme_id)
+                if len(self._convert_cache) > _CONVERT_CACHE_MAXSIZE:
+                    self._convert_cache.popitem(last=False)
+                message = _copy_message(message)
+
             self.logger.debug(f"成功转换抖音视频: {source_data.get('aweme_id', 'unknown')}")
             return message
 
@@ -85,20 +213,22 @@ class DouyinConverter(MessageConverter):
         Returns:
             List[TelegramMessage]: 转换后的消息列表
         """
-        messages = []
+        total = len(source_data_list)
+
+        # 预分配结果列表，按索引写入，失败且无法降级的位置保持None
+        results: List[Optional[TelegramMessage]] = [None] * total
         for i, data in enumerate(source_data_list):
             try:
-                message = self.convert(data, **kwargs)
-                messages.append(message)
-                self.logger.debug(f"批量转换进度: {i+1}/{len(source_data_list)}")
+                results[i] = self.convert(data, **kwargs)
+                if (i + 1) % _BATCH_PROGRESS_LOG_INTERVAL == 0:
+                    self.logger.debug("批量转换进度: %d/%d", i + 1, total)
             except Exception as e:
-                self.logger.error(f"批量转换第{i+1}个视频失败: {str(e)}", exc_info=True)
+                self.logger.error("批量转换第%d个视频失败: %s", i + 1, e, exc_info=True)
                 # 尝试降级处理
-                fallback_message = self.handle_conversion_error(e, data)
-                if fallback_message:
-                    messages.append(fallback_message)
+                results[i] = self.handle_conversion_error(e, data)
 
-        self.logger.info(f"批量转换完成: {len(messages)}/{len(source_data_list)} 个视频")
+        messages = [message for message in results if message is not None]
+        self.logger.info("批量转换完成: %d/%d 个视频", len(messages), total)
         return messages
 
     def _format_video_text(self, video_data: Dict[str, Any]) -> str:
@@ -112,93 +242,93 @@ class DouyinConverter(MessageConverter):
             str: 格式化后的文本内容
         """
         try:
+            # 一次性取出顶层字段（缺失字段为None）
+            aweme_id, desc, caption, create_time, author, statistics, music = map(video_data.get, _TEXT_FIELDS)
+
             # 基本信息
-            aweme_id = video_data.get('aweme_id', 'unknown')
-            desc = video_data.get('desc', '').strip()
-            caption = video_data.get('caption', '').strip()
-            create_time = video_data.get('create_time', 0)
+            if aweme_id is None:
+                aweme_id = 'unknown'
+            # 抖音接口返回的文本可能带首尾空白，只对非空字段调用strip
+            desc = desc.strip() if desc else ''
+            caption = caption.strip() if caption else ''
+            create_time = create_time or 0
 
             # 作者信息
-            author = video_data.get('author', {})
-            author_nickname = author.get('nickname', '').strip()
+            author_nickname = author.get('nickname') if author else None
+            author_nickname = author_nickname.strip() if author_nickname else ''
 
             # 统计信息
-            statistics = video_data.get('statistics', {})
+            statistics = statistics or {}
             share_count = statistics.get('share_count', 0)
             digg_count = statistics.get('digg_count', 0)
             comment_count = statistics.get('comment_count', 0)
 
             # 音乐信息
-            music = video_data.get('music', {})
-            music_title = music.get('title', '').strip()
-            music_author = music.get('author', '').strip()
-
-            # 构建消息文本
-            caption_parts = []
+            music = music or {}
+            music_title = music.get('title')
+            music_title = music_title.strip() if music_title else ''
+            music_author = music.get('author')
+            music_author = music_author.strip() if music_author else ''
 
             # 第一行：仅标题
             title = desc or caption or f"抖音视频 {aweme_id}"
-            max_title_length = 80
-            if len(title) > max_title_length:
-                title = title[:max_title_length] + "..."
+            if len(title) > _MAX_TITLE_LENGTH:
+                title = title[:_MAX_TITLE_LENGTH] + "..."
 
-            safe_title = self._escape_markdown(title)
-            caption_parts.append(f"`{safe_title}`")
+            title_line = f"`{self._escape_markdown(title)}`"
 
             # 第二行：统计信息 + 作者（用 • 分隔）
             stats_parts = []
             if digg_count > 0:
-                stats_parts.append(f"❤️ {self._format_count(digg_count)}")
+                stats_parts.append(f"`❤️ {self._format_count(digg_count)}`")
             if comment_count > 0:
-                stats_parts.append(f"💬 {self._format_count(comment_count)}")
+                stats_parts.append(f"`💬 {self._format_count(comment_count)}`")
             if share_count > 0:
-                stats_parts.append(f"🔄 {self._format_count(share_count)}")
+                stats_parts.append(f"`🔄 {self._format_count(share_count)}`")
 
             # 添加作者信息到统计行
             if author_nickname:
-                safe_nickname = self._escape_markdown(author_nickname)
-                stats_parts.append(f"👤 {safe_nickname}")
+                stats_parts.append(f"`👤 {self._escape_markdown(author_nickname)}`")
 
-            if stats_parts:
-                stats_parts = [f"`{part}`" for part in stats_parts]
-                caption_parts.append(" • ".join(stats_parts))
+            stats_line = " • ".join(stats_parts)
 
             # 第三行：音乐信息（如果有）
+            music_line = ""
             if music_title:
-                max_music_length = 35
-                if len(music_title) > max_music_length:
-                    music_title = music_title[:max_music_length] + "..."
+                if len(music_title) > _MAX_MUSIC_LENGTH:
+                    music_title = music_title[:_MAX_MUSIC_LENGTH] + "..."
 
-                safe_music_title = self._escape_markdown(music_title)
-                music_text = f"🎵 {safe_music_title}"
+                music_text = f"🎵 {self._escape_markdown(music_title)}"
 
                 # 添加音乐作者（如果与视频作者不同）
                 if music_author and music_author != author_nickname:
-                    safe_music_author = self._escape_markdown(music_author)
-                    music_text += f"` - {safe_music_author}`"
+                    music_text += f"` - {self._escape_markdown(music_author)}`"
 
                 # 将音乐信息设置为斜体
-                music_text = f"`{music_text}`"
-                caption_parts.append(music_text)
+                music_line = f"`{music_text}`"
 
             # 第四行：标签
+            tag_line = ""
             if author_nickname:
-                clean_author = author_nickname.replace('@', '').replace('#', '').replace('_', '').replace(' ', '')
-                caption_parts.append(f"#{clean_author}")
+                clean_author = author_nickname.translate(_TAG_STRIP_TABLE)
+                tag_line = f"#{clean_author}"
+
+            # 按消息形态（统计行/音乐行/标签行是否存在）选择预先生成的模板，一次拼接
+            shape = (bool(stats_line) << 2) | (bool(music_line) << 1) | bool(tag_line)
+            text = _CAPTION_FORMATTERS[shape](title_line, stats_line, music_line, tag_line)
 
             # 最后一行：查看原视频链接 + 日期
             if aweme_id:
                 douyin_link = f"https://www.douyin.com/video/{aweme_id}"
-                last_line = f"[查看原视频]({douyin_link})"
 
                 # 将日期拼接到最后一行
                 if create_time > 0:
-                    time_str = datetime.fromtimestamp(create_time).strftime('%Y-%m-%d')
-                    last_line += f" • `{time_str}`"
+                    time_str = _format_date_bucket(create_time // _DATE_BUCKET_SECONDS)
+                    text = f"{text}\n\n[查看原视频]({douyin_link}) • `{time_str}`"
+                else:
+                    text = f"{text}\n\n[查看原视频]({douyin_link})"
 
-                caption_parts.append(last_line)
-
-            return "\n\n".join(caption_parts)
+            return text
 
         except Exception as e:
             self.logger.error(f"格式化视频文本失败: {str(e)}", exc_info=True)
@@ -225,8 +355,8 @@ class DouyinConverter(MessageConverter):
             if not url_list:
                 return None
 
-            # 选择最后一个可用的URL
-            video_url = url_list[-1]
+            # 从后往前选择最后一个非空的URL
+            video_url = next((url for url in reversed(url_list) if url), None)
             if not video_url:
                 return None
 
@@ -240,9 +370,8 @@ class DouyinConverter(MessageConverter):
             cover_info = video_data.get('cover', {})
             thumbnail_url = None
             if cover_info:
-                cover_url_list = cover_info.get('url_list', [])
-                if cover_url_list:
-                    thumbnail_url = cover_url_list[0]
+                # 选择第一个非空的封面URL
+                thumbnail_url = next((url for url in cover_info.get('url_list', []) if url), None)
 
             # 转换时长（毫秒转秒）
             duration_seconds = duration // 1000 if duration > 0 else None
@@ -272,19 +401,8 @@ class DouyinConverter(MessageConverter):
         Returns:
             bool: 数据是否有效
         """
-        try:
-            if not isinstance(source_data, dict):
-                return False
-
-            # 检查必要字段
-            if not source_data.get('aweme_id'):
-                return False
-
-            return True
-
-        except Exception as e:
-            self.logger.error(f"验证源数据失败: {str(e)}", exc_info=True)
-            return False
+        # 必须是字典且包含非空的aweme_id（纯真值判断，不会抛出异常）
+        return isinstance(source_data, dict) and bool(source_data.get('aweme_id'))
 
     def extract_media_items(self, source_data: Any) -> List[MediaItem]:
         """
@@ -315,12 +433,7 @@ class DouyinConverter(MessageConverter):
         Returns:
             str: 显示名称
         """
-        try:
-            parsed = urlparse(source_url)
-            domain = parsed.netloc
-            return f"抖音: {domain}"
-        except Exception:
-            return f"抖音: {source_url}"
+        return _source_display_name(source_url)
 
     def _escape_markdown(self, text: str) -> str:
         """
@@ -332,16 +445,7 @@ class DouyinConverter(MessageConverter):
         Returns:
             str: 转义后的文本
         """
-        if not text:
-            return ""
-
-        # Markdown特殊字符
-        special_chars = ['*', '_', '`', '[', ']', '(', ')', '~', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-
-        return text
+        return _escape_markdown_cached(str(text)) if text else ""
 
     def _format_duration(self, duration_ms: int) -> str:
         """
@@ -353,17 +457,15 @@ class DouyinConverter(MessageConverter):
         Returns:
             str: 格式化后的时长字符串
         """
-        try:
-            seconds = duration_ms // 1000
-            minutes = seconds // 60
-            seconds = seconds % 60
-
-            if minutes > 0:
-                return f"{minutes}分{seconds}秒"
-            else:
-                return f"{seconds}秒"
-        except Exception:
+        # 非数值（或NaN/无穷大）输入视为未知，浮点数（如JSON中的12345.0）取整后按整数处理
+        if not isinstance(duration_ms, Real) or (isinstance(duration_ms, float) and not math.isfinite(duration_ms)):
             return "未知"
+        duration_ms = int(duration_ms)
+
+        minutes, seconds = divmod(duration_ms // 1000, 60)
+        if minutes > 0:
+            return f"{minutes}分{seconds}秒"
+        return f"{seconds}秒"
 
     def _format_count(self, count: int) -> str:
         """
@@ -375,15 +477,22 @@ class DouyinConverter(MessageConverter):
         Returns:
             str: 格式化后的数字字符串
         """
-        try:
-            if count >= 10000:
-                return f"{count/10000:.1f}万"
-            elif count >= 1000:
-                return f"{count/1000:.1f}k"
-            else:
-                return str(count)
-        except Exception:
+        # 非数值（或NaN/无穷大）输入视为0，浮点数（如JSON中的12345.0）取整后按整数处理
+        if not isinstance(count, Real) or (isinstance(count, float) and not math.isfinite(count)):
             return "0"
+        count = int(count)
+
+        # 整数运算保留一位小数（四舍五入），避免浮点除法与浮点格式化
+        if count >= 10000:
+            whole, tenth = divmod((count + 500) // 1000, 10)
+            return f"{whole}.{tenth}万"
+        elif count >= 1000:
+            whole, tenth = divmod((count + 50) // 100, 10)
+            return f"{whole}.{tenth}k"
+        elif count >= 0:
+            return _SMALL_COUNT_STRS[count]
+        else:
+            return str(count)
 
     def handle_conversion_error(self, error: Exception, source_data: Any) -> Optional[TelegramMessage]:
         """
@@ -406,27 +515,25 @@ class DouyinConverter(MessageConverter):
                 author = source_data.get('author', {})
                 author_nickname = author.get('nickname', '未知用户')
 
-                # 创建简化的消息
-                fallback_text = f"🎵 **抖音视频**\n\n"
-                fallback_text += f"📱 **视频ID：** {aweme_id}\n"
-                fallback_text += f"👤 **作者：** {author_nickname}\n"
-
+                # 创建简化的消息（描述行可选）
                 if desc:
                     desc_short = desc[:100] + "..." if len(desc) > 100 else desc
-                    fallback_text += f"📝 **描述：** {desc_short}\n"
-
-                fallback_text += f"\n⚠️ 部分内容解析失败"
-
-                return TelegramMessage.create_text_message(
-                    text=fallback_text,
-                    parse_mode="Markdown"
+                    desc_line = f"📝 **描述：** {desc_short}\n"
+                else:
+                    desc_line = ""
+
+                fallback_text = (
+                    f"🎵 **抖音视频**\n\n"
+                    f"📱 **视频ID：** {aweme_id}\n"
+                    f"👤 **作者：** {author_nickname}\n"
+                    f"{desc_line}"
+                    f"\n⚠️ 部分内容解析失败"
                 )
 
+                return _new_markdown_message(fallback_text)
+
             # 如果连基本信息都无法提取，返回通用错误消息
-            return TelegramMessage.create_text_message(
-                text="🎵 **抖音视频**\n\n⚠️ 内容解析失败",
-                parse_mode="Markdown"
-            )
+            return _new_markdown_message(_GENERIC_FAILURE_TEXT)
 
         except Exception as fallback_error:
             self.logger.error(f"降级处理也失败: {str(fallback_error)}", exc_info=True)
@@ -498,6 +605,10 @@ def test_douyin_converter():
         messages = converter.convert_batch(batch_data)
         print(f"✅ 批量转换成功: {len(messages)} 条消息")
 
+        # 转义缓存命中情况
+        cache_info = _escape_markdown_cached.cache_info()
+        print(f"📊 转义缓存: 命中 {cache_info.hits} 次, 未命中 {cache_info.misses} 次")
+
         print("🎉 抖音转换器测试完成！")
 
     except Exception as e:
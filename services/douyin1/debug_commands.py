@@ -11,16 +11,220 @@
 创建时间: 2024年
 """
 
+import asyncio
+import io
 import logging
 import json
+import re
+import time
+from typing import Dict, List, Optional, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes, Application, CommandHandler, MessageHandler, filters
 
 from .commands import get_command_handler
-from .converter import create_douyin_converter
+from .converter import DouyinConverter, create_douyin_converter
 from services.common.unified_sender import UnifiedTelegramSender
+from services.common.message_converter import ConversionError
+from services.common import json_utils
 from . import MODULE_NAME, MODULE_DISPLAY_NAME, get_command_names
 
+# 尝试导入ijson（用于流式解析大文件）
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+# 动态生成的命令名称（模块加载时计算一次）
+_COMMAND_NAMES = get_command_names()
+_DEBUG_SHOW_CMD = _COMMAND_NAMES["debug_show"]
+_DEBUG_FILE_CMD = f"{MODULE_NAME}_debug_file"
+_DEBUG_FILE_CAPTION_RE = re.compile(rf"\b{re.escape(_DEBUG_FILE_CMD)}\b")
+
+# 允许的链接协议前缀
+_VALID_SCHEMES = ('http://', 'https://')
+
+# 调试JSON文件的最大大小（字节），超过则拒绝下载
+_MAX_DEBUG_JSON_BYTES = 10 * 1024 * 1024
+
+# 超过该大小（字节）时使用ijson流式解析，只保留转换器需要的字段
+_STREAM_PARSE_THRESHOLD = 1024 * 1024
+# DouyinConverter.convert实际读取的顶层字段
+_CONVERTER_FIELDS = frozenset((
+    'aweme_id', 'desc', 'caption', 'create_time', 'author', 'statistics', 'music',
+    'video', 'duration', 'cover'
+))
+# JSON解析可能抛出的格式错误
+_JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if IJSON_AVAILABLE else (json.JSONDecodeError,)
+
+
+# 转换器和发送器（首次使用时创建，后续复用；发送器不持有Bot相关状态，bot在发送时传入）
+_converter: Optional[DouyinConverter] = None
+_sender: Optional[UnifiedTelegramSender] = None
+
+
+def _get_converter() -> DouyinConverter:
+    """
+    获取共享的抖音转换器实例
+
+    Returns:
+        DouyinConverter: 转换器实例
+    """
+    global _converter
+    if _converter is None:
+        _converter = create_douyin_converter()
+    return _converter
+
+
+def _get_sender() -> UnifiedTelegramSender:
+    """
+    获取共享的统一发送器实例
+
+    Returns:
+        UnifiedTelegramSender: 发送器实例
+    """
+    global _sender
+    if _sender is None:
+        _sender = UnifiedTelegramSender()
+    return _sender
+
+
+# fetch_latest_content结果的短期缓存: {源URL: (缓存时间, (是否成功, 消息, 内容列表))}
+_FETCH_CACHE_TTL = 60
+_FETCH_CACHE_MAXSIZE = 256
+_fetch_cache: Dict[str, Tuple[float, Tuple[bool, str, Optional[List[Dict]]]]] = {}
+# 每个URL一把锁，避免并发请求同一URL时重复获取
+_fetch_locks: Dict[str, asyncio.Lock] = {}
+# 每把锁的使用者计数（持有者+等待者），归零时才删除锁对象
+_fetch_lock_users: Dict[str, int] = {}
+
+
+async def _fetch_latest_content_cached(manager, source_url: str) -> Tuple[bool, str, Optional[List[Dict]]]:
+    """
+    获取最新内容（成功结果缓存 _FETCH_CACHE_TTL 秒）
+
+    Args:
+        manager: 内容管理器
+        source_url: 账号URL
+
+    Returns:
+        Tuple[bool, str, Optional[List[Dict]]]: (是否成功, 消息, 内容列表)
+    """
+    cached = _fetch_cache.get(source_url)
+    if cached is not None and time.monotonic() - cached[0] < _FETCH_CACHE_TTL:
+        return cached[1]
+
+    lock = _fetch_locks.get(source_url)
+    if lock is None:
+        lock = _fetch_locks[source_url] = asyncio.Lock()
+    _fetch_lock_users[source_url] = _fetch_lock_users.get(source_url, 0) + 1
+
+    try:
+        async with lock:
+            # 等待锁期间其他请求可能已完成获取
+            cached = _fetch_cache.get(source_url)
+            if cached is not None and time.monotonic() - cached[0] < _FETCH_CACHE_TTL:
+                return cached[1]
+
+            # 使用异步获取路径，管理器和获取器的状态只在事件循环线程中访问（与调度器一致）
+            result = await manager.fetch_latest_content_async(source_url)
+
+            # 只缓存成功结果，失败时下次重新获取
+            if result[0]:
+                if len(_fetch_cache) >= _FETCH_CACHE_MAXSIZE:
+                    # 淘汰最早写入的条目
+                    _fetch_cache.pop(next(iter(_fetch_cache)))
+                _fetch_cache.pop(source_url, None)
+                _fetch_cache[source_url] = (time.monotonic(), result)
+
+            return result
+    finally:
+        # 最后一个使用者离开时才删除锁对象（锁释放后、被唤醒的等待者获取前仍显示未锁定，不能以locked()判断）
+        remaining = _fetch_lock_users[source_url] - 1
+        if remaining:
+            _fetch_lock_users[source_url] = remaining
+        else:
+            del _fetch_lock_users[source_url]
+            del _fetch_locks[source_url]
+
+
+def _parse_debug_json(file_buffer: io.BytesIO, size: int) -> Dict:
+    """
+    解析调试JSON文件
+
+    Args:
+        file_buffer: 已下载的文件内容
+        size: 文件大小（字节）
+
+    Returns:
+        Dict: 视频数据（大文件只包含转换器需要的顶层字段）
+    """
+    if IJSON_AVAILABLE and size > _STREAM_PARSE_THRESHOLD:
+        file_buffer.seek(0)
+        return {
+            key: value
+            for key, value in ijson.kvitems(file_buffer, '', use_float=True)
+            if key in _CONVERTER_FIELDS
+        }
+    # 直接解析缓冲区内容（memoryview零拷贝），不再额外复制为bytearray/str
+    return json_utils.loads(file_buffer.getbuffer())
+
+
+async def _send_to_channel(sender: UnifiedTelegramSender, bot, channel: str, telegram_message) -> bool:
+    """
+    发送消息到单个频道（重试由统一发送器处理）
+
+    Args:
+        sender: 统一发送器
+        bot: Telegram Bot实例
+        channel: 目标频道ID
+        telegram_message: 要发送的消息
+
+    Returns:
+        bool: 是否发送成功
+    """
+    try:
+        sent_messages = await sender.send_message(
+            bot=bot,
+            chat_id=channel,
+            message=telegram_message
+        )
+        if sent_messages:
+            logger.info("✅ 成功发送到频道: %s, 发送了%s条消息", channel, len(sent_messages))
+            return True
+        logger.error("❌ 发送到频道失败: %s", channel)
+    except Exception as e:
+        logger.error("❌ 发送到频道%s时发生错误: %s", channel, e)
+    return False
+
+
+# 调试显示结果的标题预览最大长度
+_TITLE_PREVIEW_LENGTH = 50
+
+# 状态消息的固定前缀
+_LBL_FOUND = "✅ 找到 "
+_LBL_TITLE = "标题: "
+_LBL_TEST_DONE = "✅ 测试完成: "
+
+
+def _format_item(first_item: Dict, total: int) -> str:
+    """
+    格式化调试显示命令的结果消息
+
+    Args:
+        first_item: 第一个内容项
+        total: 内容总数
+
+    Returns:
+        str: 格式化后的消息文本
+    """
+    title = first_item.get('title') or 'Unknown'
+    preview = title[:_TITLE_PREVIEW_LENGTH] + ('...' if len(title) > _TITLE_PREVIEW_LENGTH else '')
+    return "\n".join((_LBL_FOUND + str(total) + " 个内容", _LBL_TITLE + preview))
+
 
 async def handle_debug_show_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -30,71 +234,72 @@ async def handle_debug_show_command(update: Update, context: ContextTypes.DEFAUL
         update: Telegram更新对象
         context: 命令上下文
     """
+    processing_message = None
     try:
         user = update.message.from_user
-        command_names = get_command_names()
-        debug_show_cmd = command_names["debug_show"]
-
-        logging.info(f"👁️ 收到{debug_show_cmd}命令 - 用户: {user.username}(ID:{user.id})")
+        logger.info("👁️ 收到%s命令 - 用户: %s(ID:%s)", _DEBUG_SHOW_CMD, user.username, user.id)
 
         # 参数验证
         if not context.args:
-            await update.message.reply_text(f"用法: /{debug_show_cmd} <链接>")
+            await update.message.reply_text(f"用法: /{_DEBUG_SHOW_CMD} <链接>")
             return
 
         source_url = context.args[0].strip()
-        logging.info(f"👁️ 显示内容项: {source_url}")
-
-        # 获取命令处理器
-        handler = get_command_handler()
+        if not source_url:
+            await update.message.reply_text("❌ 请提供有效的链接")
+            return
+        logger.info("👁️ 显示内容项: %s", source_url)
 
         # 基本URL检查（简化版）
-        if not source_url or not source_url.startswith(('http://', 'https://')):
+        if not source_url.startswith(_VALID_SCHEMES):
             await update.message.reply_text("❌ 请提供有效的链接")
             return
 
+        # 获取命令处理器（在发送处理中消息之前检查，服务不可用时只回复一次）
+        handler = get_command_handler()
+        if handler is None or getattr(handler, 'manager', None) is None:
+            await update.message.reply_text("❌ 服务未就绪")
+            return
+
         # 发送处理中消息
         processing_message = await update.message.reply_text("⏳ 获取内容中...")
 
-        try:
-            # 获取最新内容
-            success, message, content_list = handler.manager.fetch_latest_content(source_url)
-
-            if not success:
-                logging.error(f"❌ 获取内容失败: {message}")
-                await processing_message.edit_text(f"❌ 获取失败: {message}")
-                return
-
-            if not content_list:
-                logging.info(f"📭 没有找到内容: {source_url}")
-                await processing_message.edit_text("📭 没有找到内容")
-                return
-
-            # 显示第一个内容项
-            first_item = content_list[0]
-
-            # 记录详细信息到日志
-            logging.info(f"👁️ 内容项详情:")
-            logging.info(f"  标题: {first_item.get('title', 'Unknown')}")
-            logging.info(f"  作者: {first_item.get('author', 'Unknown')}")
-            logging.info(f"  链接: {first_item.get('url', source_url)}")
-            logging.info(f"  内容ID: {handler.manager.generate_content_id(first_item)}")
-            logging.info(f"  发布时间: {first_item.get('publish_time', 'Unknown')}")
-            logging.info(f"  总内容数: {len(content_list)}")
-
-            # 简化的消息显示
-            await processing_message.edit_text(
-                f"✅ 找到 {len(content_list)} 个内容\n"
-                f"标题: {first_item.get('title', 'Unknown')[:50]}{'...' if len(first_item.get('title', '')) > 50 else ''}"
-            )
-
-        except Exception as e:
-            logging.error(f"❌ 显示内容项失败: {e}", exc_info=True)
-            await processing_message.edit_text(f"❌ 显示失败: {str(e)}")
+        # 获取最新内容
+        success, message, content_list = await _fetch_latest_content_cached(handler.manager, source_url)
+
+        if not success:
+            logger.error("❌ 获取内容失败: %s", message)
+            await processing_message.edit_text(f"❌ 获取失败: {message}")
+            return
+
+        if not content_list:
+            logger.info("📭 没有找到内容: %s", source_url)
+            await processing_message.edit_text("📭 没有找到内容")
+            return
+
+        # 显示第一个内容项
+        first_item = content_list[0]
+
+        # 记录详细信息到日志（INFO未启用时跳过字段查找和内容ID计算）
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("👁️ 内容项详情:")
+            logger.info("  标题: %s", first_item.get('title', 'Unknown'))
+            logger.info("  作者: %s", first_item.get('author', 'Unknown'))
+            logger.info("  链接: %s", first_item.get('url', source_url))
+            logger.info("  内容ID: %s", handler.manager.generate_content_id(first_item))
+            logger.info("  发布时间: %s", first_item.get('publish_time', 'Unknown'))
+            logger.info("  总内容数: %s", len(content_list))
+
+        # 简化的消息显示（仅在成功获取内容后构建）
+        await processing_message.edit_text(_format_item(first_item, len(content_list)))
 
     except Exception as e:
-        logging.error(f"❌ 处理调试显示命令时发生错误: {e}", exc_info=True)
-        await update.message.reply_text(f"❌ 处理命令时发生错误: {str(e)}")
+        logger.error("❌ 处理调试显示命令时发生错误: %s", e, exc_info=True)
+        # 已发送处理中消息时直接编辑它，否则回复新消息
+        if processing_message is not None:
+            await processing_message.edit_text(f"❌ 显示失败: {str(e)}")
+        else:
+            await update.message.reply_text(f"❌ 处理命令时发生错误: {str(e)}")
 
 
 async def handle_debug_file_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -105,98 +310,62 @@ async def handle_debug_file_message(update: Update, context: ContextTypes.DEFAUL
         update: Telegram更新对象
         context: 命令上下文
     """
+    processing_message = None
     try:
-        # 检查是否是文档消息且caption包含debug_file命令
-        if not update.message.document:
-            return
-
-        caption = update.message.caption or ""
-        debug_file_cmd = f"{MODULE_NAME}_debug_file"
-
-        if debug_file_cmd not in caption:
-            return
-
+        # 文档类型与caption中的debug_file命令已由注册时的过滤器保证
         user = update.message.from_user
-        logging.info(f"📄 收到{debug_file_cmd}文件消息 - 用户: {user.username}(ID:{user.id})")
+        logger.info("📄 收到%s文件消息 - 用户: %s(ID:%s)", _DEBUG_FILE_CMD, user.username, user.id)
 
-        # 文档已经在上面检查过了，直接处理
+        # 下载前检查文件大小，避免超大文件占满内存
+        size = update.message.document.file_size or 0
+        if size > _MAX_DEBUG_JSON_BYTES:
+            logger.warning("⚠️ 调试文件过大: %s bytes", size)
+            await update.message.reply_text(f"❌ 文件过大 ({size} bytes)")
+            return
 
         # 发送简单的处理中消息
         processing_message = await update.message.reply_text("⏳ 处理中...")
 
+        # 下载文件
+        file = await context.bot.get_file(update.message.document.file_id)
+        file_buffer = io.BytesIO()
+        await file.download_to_memory(out=file_buffer)
+
+        # 解析JSON
         try:
-            # 下载文件
-            file = await context.bot.get_file(update.message.document.file_id)
-            file_content = await file.download_as_bytearray()
-
-            # 解析JSON
-            try:
-                video_data = json.loads(file_content.decode('utf-8'))
-                logging.info(f"📄 成功解析JSON文件，aweme_id: {video_data.get('aweme_id', 'unknown')}")
-            except json.JSONDecodeError as e:
-                logging.error(f"❌ JSON文件格式错误: {e}")
-                await processing_message.edit_text(f"❌ JSON格式错误: {str(e)}")
-                return
-
-            # 创建converter并转换
-            converter = create_douyin_converter()
-            try:
-                telegram_message = converter.convert(video_data)
-                logging.info(f"✅ converter转换成功，文本长度: {len(telegram_message.text)}, 媒体数量: {telegram_message.media_count}")
-
-            except Exception as e:
-                logging.error(f"❌ converter转换失败: {e}", exc_info=True)
-                await processing_message.edit_text(f"❌ 转换失败: {str(e)}")
-                return
-
-            # 获取目标频道
-            # 直接使用当前聊天作为目标频道
-            target_channels = [str(update.effective_chat.id)]
-            if not target_channels:
-                await processing_message.edit_text(
-                    f"❌ JSON文件中缺少target_channels字段\n"
-                    f"请在JSON中添加target_channels数组"
-                )
-                return
-
-            # 使用统一发送器发送消息
-            sender = UnifiedTelegramSender()
-            try:
-                # 发送到指定频道
-                success_count = 0
-                total_channels = len(target_channels)
-
-                for channel in target_channels:
-                    try:
-                        sent_messages = await sender.send_message(
-                            bot=context.bot,
-                            chat_id=channel,
-                            message=telegram_message
-                        )
-                        if sent_messages:
-                            success_count += 1
-                            logging.info(f"✅ 成功发送到频道: {channel}, 发送了{len(sent_messages)}条消息")
-                        else:
-                            logging.error(f"❌ 发送到频道失败: {channel}")
-                    except Exception as e:
-                        logging.error(f"❌ 发送到频道{channel}时发生错误: {str(e)}")
-
-                # 更新结果
-                await processing_message.edit_text(
-                    f"✅ 测试完成: {success_count}/{total_channels} 成功"
-                )
-
-            except Exception as e:
-                logging.error(f"❌ 统一发送器发送失败: {e}", exc_info=True)
-                await processing_message.edit_text(f"❌ 发送失败: {str(e)}")
-
-        except Exception as e:
-            logging.error(f"❌ 处理文件失败: {e}", exc_info=True)
-            await processing_message.edit_text(f"❌ 处理失败: {str(e)}")
+            video_data = _parse_debug_json(file_buffer, size)
+        except _JSON_ERRORS as e:
+            logger.error("❌ JSON文件格式错误: %s", e)
+            await processing_message.edit_text(f"❌ JSON格式错误: {str(e)}")
+            return
+        logger.info("📄 成功解析JSON文件，aweme_id: %s", video_data.get('aweme_id', 'unknown'))
+
+        # 创建converter并转换（转换器内部已记录详细错误）
+        try:
+            telegram_message = _get_converter().convert(video_data)
+        except ConversionError as e:
+            await processing_message.edit_text(f"❌ 转换失败: {str(e)}")
+            return
+        # media_count是计算属性，只读取一次
+        text_len = len(telegram_message.text)
+        media_count = telegram_message.media_count
+        logger.info("✅ converter转换成功，文本长度: %s, 媒体数量: %s", text_len, media_count)
+
+        # 直接发送到当前聊天
+        success = await _send_to_channel(_get_sender(), context.bot, str(update.effective_chat.id), telegram_message)
+
+        # 更新结果
+        await processing_message.edit_text(
+            f"{_LBL_TEST_DONE}{1 if success else 0}/1 成功"
+        )
 
     except Exception as e:
-        logging.error(f"❌ 处理调试文件消息时发生错误: {e}", exc_info=True)
-        await update.message.reply_text(f"❌ 处理文件时发生错误: {str(e)}")
+        logger.error("❌ 处理调试文件消息时发生错误: %s", e, exc_info=True)
+        # 已发送处理中消息时直接编辑它，否则回复新消息
+        if processing_message is not None:
+            await processing_message.edit_text(f"❌ 处理失败: {str(e)}")
+        else:
+            await update.message.reply_text(f"❌ 处理文件时发生错误: {str(e)}")
 
 
 def register_debug_commands(application: Application) -> None:
@@ -206,18 +375,16 @@ def register_debug_commands(application: Application) -> None:
     Args:
         application: Telegram应用实例
     """
-    # 获取动态生成的命令名称
-    command_names = get_command_names()
-
-    # 注册debug show命令（使用动态生成的命令名称）
-    application.add_handler(CommandHandler(command_names["debug_show"], handle_debug_show_command))
-
-    # 注册文档消息处理器，检测caption中的debug_file命令
-    document_handler = MessageHandler(filters.Document.ALL, handle_debug_file_message)
-    application.add_handler(document_handler)
-
-    debug_file_cmd = f"{MODULE_NAME}_debug_file"
-
-    logging.info(f"{MODULE_DISPLAY_NAME}调试命令处理器注册完成")
-    logging.info(f"📋 已注册调试命令: /{command_names['debug_show']}")
-    logging.info(f"🔧 已注册调试文件处理器: 检测caption中的{debug_file_cmd}")
\ No newline at end of file
+    application.add_handlers([
+        # 注册debug show命令（使用动态生成的命令名称）
+        CommandHandler(_DEBUG_SHOW_CMD, handle_debug_show_command),
+        # 注册文档消息处理器，只分发caption中包含debug_file命令的文档消息
+        MessageHandler(
+            filters.UpdateType.MESSAGE & filters.Document.ALL & filters.CaptionRegex(_DEBUG_FILE_CAPTION_RE),
+            handle_debug_file_message
+        ),
+    ])
+
+    logger.info(f"{MODULE_DISPLAY_NAME}调试命令处理器注册完成")
+    logger.info(f"📋 已注册调试命令: /{_DEBUG_SHOW_CMD}")
+    logger.info(f"🔧 已注册调试文件处理器: 检测caption中的{_DEBUG_FILE_CMD}")
\ No newline at end of file
@@ -15,14 +15,124 @@
 创建时间: 2024年
 """
 
+import asyncio
+import functools
 import logging
-import requests
+import urllib3
+from urllib3.util.retry import Retry
 import hashlib
 import re
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse, parse_qs
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse, parse_qs
 import time
+import traceback
+from datetime import datetime
 from services.common.cache import get_cache
+from services.common import json_utils
+
+# 尝试导入httpx（python-telegram-bot的依赖，用于异步获取）
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+# sec_user_id格式（MS4wLjABAAAA...）
+_SEC_UID_RE = re.compile(r'MS4wLjABAAAA[A-Za-z0-9_-]+')
+
+# 抖音域名（douyin.com / v.douyin.com / iesdouyin.com，忽略大小写）
+_DOUYIN_DOMAIN_RE = re.compile(r'(?:v\.|ies)?douyin\.com', re.IGNORECASE)
+
+# 已是完整用户主页的URL特征（包含时无需解析重定向）
+_RESOLVED_URL_MARKERS = ("douyin.com/user/", "iesdouyin.com/share/user/")
+
+# 分页获取时每页的视频数量
+_PAGE_SIZE = 20
+
+# 短链接解析的最大重定向次数
+_MAX_REDIRECTS = 5
+
+# 自适应缓存TTL：TTL = 平均发布间隔 / 4，限制在5分钟到6小时之间
+_MIN_ADAPTIVE_TTL = 300
+_MAX_ADAPTIVE_TTL = 6 * 3600
+# 发布间隔指数移动平均的平滑系数，以及启用自适应TTL所需的最少观测次数
+_TTL_EMA_ALPHA = 0.3
+_TTL_MIN_SAMPLES = 3
+
+# 短链接解析结果的保存时间（秒），30天
+_REDIRECT_CACHE_TTL = 30 * 86400
+
+@functools.lru_cache(maxsize=2048)
+def _cache_key_for(douyin_url: str) -> str:
+    """
+    根据抖音URL计算缓存键（纯函数，结果按URL缓存）
+
+    Args:
+        douyin_url: 抖音URL
+
+    Returns:
+        str: 缓存键
+    """
+    # 使用抖音URL生成唯一的缓存键（非加密用途，BLAKE2b比MD5更快）
+    cache_key = hashlib.blake2b(douyin_url.encode('utf-8'), digest_size=10).hexdigest()
+    return f"douyin_api:{cache_key}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_douyin_url(url: str) -> bool:
+    """
+    检查URL是否包含抖音域名（纯函数，订阅URL集合稳定，结果按URL缓存）
+
+    Args:
+        url: 待验证的URL
+
+    Returns:
+        bool: 是否包含抖音域名
+    """
+    return _DOUYIN_DOMAIN_RE.search(url) is not None
+
+
+# 默认请求头
+_DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "Cache-Control": "no-cache",
+}
+
+# 异步获取共享的HTTP客户端（首次使用时创建）
+_async_client: Optional["httpx.AsyncClient"] = None
+
+
+def _get_async_client() -> "httpx.AsyncClient":
+    """
+    获取共享的异步HTTP客户端
+
+    Returns:
+        httpx.AsyncClient: 异步HTTP客户端
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            headers=_DEFAULT_HEADERS,
+            timeout=30,
+            follow_redirects=True,
+            max_redirects=_MAX_REDIRECTS,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """
+    关闭共享的异步HTTP客户端（应用退出时调用）
+    """
+    global _async_client
+    if _async_client is not None:
+        client, _async_client = _async_client, None
+        await client.aclose()
 
 
 class DouyinFetcher:
@@ -36,18 +146,54 @@ class DouyinFetcher:
             cache_ttl: 缓存过期时间（秒），默认1小时
         """
         self.api_base = "https://api.douyin.wtf/api/douyin/web/fetch_user_post_videos"
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Cache-Control": "no-cache",
-        }
+        self.headers = dict(_DEFAULT_HEADERS)
         self.timeout = 30
         self.logger = logging.getLogger(__name__)
 
+        # 配置重试策略（重试用尽后返回最后的响应，由调用方检查状态码）
+        # total会同时限制重定向次数，因此不设总数，分别限制连接/读取/状态码重试和重定向次数
+        retry_strategy = Retry(
+            total=None,
+            connect=3,
+            read=3,
+            status=3,
+            redirect=_MAX_REDIRECTS,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+
+        # 配置HTTP连接池（复用keep-alive连接，避免每次请求重新握手；
+        # 直接使用urllib3，省去requests会话在每次请求上的额外开销）
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=20,
+            block=False,
+            headers=self.headers,
+            timeout=urllib3.Timeout(connect=5, read=self.timeout),
+            retries=retry_strategy,
+        )
+
+        # 短链接解析结果缓存（短链接指向的地址不会变化；解析失败抛出异常，不会被缓存）
+        self._resolve_short_url = functools.lru_cache(maxsize=1024)(self._head_final_url)
+
         # 初始化缓存（参考sitemap策略，存储原始数据）
         self.cache = get_cache("douyin1_api", ttl=cache_ttl, use_json=False, decode_responses=False)
 
+        # 短链接解析表（短链接指向的地址不会变化，长期保存，避免每次轮询都发送HEAD请求）
+        self.redirect_cache = get_cache(
+            "douyin1_redirect", ttl=_REDIRECT_CACHE_TTL, use_json=False, decode_responses=True
+        )
+
+        # 进程内一级缓存：保存序列化后的视频列表，热点账号无需再读取缓存后端
+        # （每次命中都重新解析，调用方修改返回的字典不会污染缓存）
+        self.local_cache = get_cache(
+            "douyin1_api_local", cache_type="memory", ttl=min(cache_ttl, 300), maxsize=512
+        )
+
+        # 每个账号发布间隔的指数移动平均值: {缓存键: (平均间隔秒数, 观测次数)}
+        self._post_interval_ema: Dict[str, Tuple[float, int]] = {}
+
         self.logger.info(f"抖音内容获取器初始化完成，缓存TTL: {cache_ttl}秒")
 
     def _generate_cache_key(self, douyin_url: str) -> str:
@@ -60,9 +206,7 @@ class DouyinFetcher:
         Returns:
             str: 缓存键
         """
-        # 使用抖音URL生成唯一的缓存键
-        cache_key = hashlib.md5(douyin_url.encode('utf-8')).hexdigest()
-        return f"douyin_api:{cache_key}"
+        return _cache_key_for(douyin_url)
 
     def extract_sec_user_id(self, douyin_url: str) -> Tuple[bool, str, Optional[str]]:
         """
@@ -107,19 +251,12 @@ class DouyinFetcher:
             Optional[str]: 重定向后的最终URL
         """
         try:
-            # 如果已经是完整的douyin.com URL，直接返回
-            if "douyin.com/user/" in url:
+            # 如果已经是完整的用户主页URL，直接返回
+            if any(marker in url for marker in _RESOLVED_URL_MARKERS):
                 return url
 
             # 处理短链接重定向
-            response = requests.head(
-                url,
-                headers=self.headers,
-                timeout=10,
-                allow_redirects=True
-            )
-
-            final_url = response.url
+            final_url = self._resolve_short_url(url)
             self.logger.debug(f"重定向解析: {url} -> {final_url}")
             return final_url
 
@@ -127,6 +264,35 @@ class DouyinFetcher:
             self.logger.error(f"重定向解析失败: {url}, 错误: {str(e)}", exc_info=True)
             return None
 
+    def _head_final_url(self, url: str) -> str:
+        """
+        获取短链接的最终URL（优先读取持久化的解析表，未命中时发送HEAD请求跟随重定向）
+
+        Args:
+            url: 短链接
+
+        Returns:
+            str: 重定向后的最终URL
+        """
+        final_url = self.redirect_cache.get(url)
+        if final_url is not None:
+            return final_url
+
+        response = self.http.request(
+            "HEAD",
+            url,
+            timeout=urllib3.Timeout(total=10),
+            redirect=True
+        )
+        # urllib3只记录最后一跳的请求路径，从重试历史中还原最终的完整URL
+        final_url = url
+        history = response.retries.history if response.retries else ()
+        for entry in history:
+            if entry.redirect_location:
+                final_url = urljoin(entry.url, entry.redirect_location)
+        self.redirect_cache.set(url, final_url)
+        return final_url
+
     def _extract_user_id_from_url(self, url: str) -> Optional[str]:
         """
         从URL中提取sec_user_id
@@ -138,15 +304,24 @@ class DouyinFetcher:
             Optional[str]: 提取的sec_user_id
         """
         try:
-            # 解析URL
-            parsed = urlparse(url)
-
             # 方式1: 从路径中提取 /user/MS4wLjABAAAA...
-            if "/user/" in parsed.path:
-                user_id = parsed.path.split("/user/")[-1].split("/")[0].split("?")[0]
-                if user_id and len(user_id) > 10:  # 基本长度检查
+            # 直接在字符串上查找切片，避免urlparse和多次split的中间对象
+            path_end = len(url)
+            for delimiter in ("?", "#"):
+                position = url.find(delimiter)
+                if 0 <= position < path_end:
+                    path_end = position
+            user_pos = url.rfind("/user/", 0, path_end)
+            if user_pos >= 0:
+                start = user_pos + 6
+                end = url.find("/", start, path_end)
+                user_id = url[start:end if end >= 0 else path_end]
+                if len(user_id) > 10:  # 基本长度检查
                     return user_id
 
+            # 解析URL
+            parsed = urlparse(url)
+
             # 方式2: 从查询参数中提取
             query_params = parse_qs(parsed.query)
             if "sec_user_id" in query_params:
@@ -154,8 +329,7 @@ class DouyinFetcher:
 
             # 方式3: 使用正则表达式匹配
             # 匹配类似 MS4wLjABAAAA... 的格式
-            pattern = r'MS4wLjABAAAA[A-Za-z0-9_-]+'
-            match = re.search(pattern, url)
+            match = _SEC_UID_RE.search(url)
             if match:
                 return match.group(0)
 
@@ -188,37 +362,44 @@ class DouyinFetcher:
             }
 
             # 发送API请求
-            response = requests.get(
-                self.api_base,
-                params=params,
-                headers=self.headers,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-
-            # 解析响应
-            data = response.json()
-
-            # 检查API响应格式
-            if not isinstance(data, dict):
-                return False, "API返回数据格式错误", None
+            response = self.http.request("GET", self.api_base, fields=params)
+            if response.status >= 400:
+                self.logger.error(f"请求抖音API失败: {sec_user_id}, HTTP状态码: {response.status}")
+                return False, f"网络请求失败: HTTP {response.status}", None
 
-            # 检查响应状态
-            if data.get("code") != 200:
-                error_msg = data.get("msg", "未知错误")
-                return False, f"API返回错误: {error_msg}", None
+            # 解析并检查响应
+            return self._check_api_response(json_utils.loads(response.data))
 
-            # 返回原始API数据
-            self.logger.info(f"成功获取用户视频API数据")
-            return True, "", data
-
-        except requests.exceptions.RequestException as e:
+        except urllib3.exceptions.HTTPError as e:
             self.logger.error(f"请求抖音API失败: {sec_user_id}, 错误: {str(e)}", exc_info=True)
             return False, f"网络请求失败: {str(e)}", None
         except Exception as e:
             self.logger.error(f"获取用户视频失败: {sec_user_id}, 错误: {str(e)}", exc_info=True)
             return False, f"处理失败: {str(e)}", None
 
+    def _check_api_response(self, data) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        检查API响应数据
+
+        Args:
+            data: 解析后的API响应
+
+        Returns:
+            Tuple[bool, str, Optional[Dict]]: (是否成功, 错误信息, 原始API数据)
+        """
+        # 检查API响应格式
+        if not isinstance(data, dict):
+            return False, "API返回数据格式错误", None
+
+        # 检查响应状态
+        if data.get("code") != 200:
+            error_msg = data.get("msg", "未知错误")
+            return False, f"API返回错误: {error_msg}", None
+
+        # 返回原始API数据
+        self.logger.info(f"成功获取用户视频API数据")
+        return True, "", data
+
     def _extract_video_info(self, aweme_data: Dict) -> Optional[Dict]:
         """
         提取视频信息
@@ -230,74 +411,80 @@ class DouyinFetcher:
             Optional[Dict]: 提取的视频信息
         """
         try:
-            # 提取基本信息
+            # 提取基本信息（get方法绑定到局部变量，减少属性查找）
+            g = aweme_data.get
             video_info = {
-                "aweme_id": aweme_data.get("aweme_id", ""),
-                "desc": aweme_data.get("desc", ""),
-                "caption": aweme_data.get("caption", ""),
-                "create_time": aweme_data.get("create_time", 0),
-                "duration": aweme_data.get("duration", 0),
-                "aweme_type": aweme_data.get("aweme_type", 0),
-                "is_top": aweme_data.get("is_top", 0),
+                "aweme_id": g("aweme_id", ""),
+                "desc": g("desc", ""),
+                "caption": g("caption", ""),
+                "create_time": g("create_time", 0),
+                "duration": g("duration", 0),
+                "aweme_type": g("aweme_type", 0),
+                "is_top": g("is_top", 0),
             }
 
             # 提取作者信息
-            author = aweme_data.get("author", {})
-            if isinstance(author, dict):
+            author = g("author", {})
+            if type(author) is dict:
+                ag = author.get
                 video_info["author"] = {
-                    "uid": author.get("uid", ""),
-                    "nickname": author.get("nickname", ""),
-                    "signature": author.get("signature", ""),
-                    "avatar_thumb": author.get("avatar_thumb", {}).get("url_list", [])
+                    "uid": ag("uid", ""),
+                    "nickname": ag("nickname", ""),
+                    "signature": ag("signature", ""),
+                    "avatar_thumb": ag("avatar_thumb", {}).get("url_list", [])
                 }
 
             # 提取统计信息
-            statistics = aweme_data.get("statistics", {})
-            if isinstance(statistics, dict):
+            statistics = g("statistics", {})
+            if type(statistics) is dict:
+                sg = statistics.get
                 video_info["statistics"] = {
-                    "play_count": statistics.get("play_count", 0),
-                    "digg_count": statistics.get("digg_count", 0),
-                    "comment_count": statistics.get("comment_count", 0),
-                    "share_count": statistics.get("share_count", 0),
-                    "collect_count": statistics.get("collect_count", 0)
+                    "play_count": sg("play_count", 0),
+                    "digg_count": sg("digg_count", 0),
+                    "comment_count": sg("comment_count", 0),
+                    "share_count": sg("share_count", 0),
+                    "collect_count": sg("collect_count", 0)
                 }
 
             # 提取视频信息
-            video = aweme_data.get("video", {})
-            if isinstance(video, dict):
-                play_addr = video.get("play_addr", {})
-                if isinstance(play_addr, dict):
+            video = g("video", {})
+            if type(video) is dict:
+                vg = video.get
+                play_addr = vg("play_addr", {})
+                if type(play_addr) is dict:
+                    pg = play_addr.get
                     video_info["video"] = {
-                        "uri": play_addr.get("uri", ""),
-                        "url_list": play_addr.get("url_list", []),
-                        "width": play_addr.get("width", 0),
-                        "height": play_addr.get("height", 0),
-                        "data_size": play_addr.get("data_size", 0),
-                        "file_hash": play_addr.get("file_hash", ""),
-                        "url_key": play_addr.get("url_key", "")
+                        "uri": pg("uri", ""),
+                        "url_list": pg("url_list", []),
+                        "width": pg("width", 0),
+                        "height": pg("height", 0),
+                        "data_size": pg("data_size", 0),
+                        "file_hash": pg("file_hash", ""),
+                        "url_key": pg("url_key", "")
                     }
 
                 # 提取封面信息
-                cover = video.get("cover", {})
-                if isinstance(cover, dict):
+                cover = vg("cover", {})
+                if type(cover) is dict:
                     video_info["cover"] = {
                         "uri": cover.get("uri", ""),
                         "url_list": cover.get("url_list", [])
                     }
 
             # 提取音乐信息
-            music = aweme_data.get("music", {})
-            if isinstance(music, dict):
+            music = g("music", {})
+            if type(music) is dict:
+                mg = music.get
                 video_info["music"] = {
-                    "id": music.get("id", ""),
-                    "title": music.get("title", ""),
-                    "author": music.get("author", ""),
-                    "play_url": music.get("play_url", {}).get("url_list", [])
+                    "id": mg("id", ""),
+                    "title": mg("title", ""),
+                    "author": mg("author", ""),
+                    "play_url": mg("play_url", {}).get("url_list", [])
                 }
 
             # 提取分享信息
-            share_info = aweme_data.get("share_info", {})
-            if isinstance(share_info, dict):
+            share_info = g("share_info", {})
+            if type(share_info) is dict:
                 video_info["share_url"] = share_info.get("share_url", "")
 
             return video_info
@@ -322,18 +509,10 @@ class DouyinFetcher:
             # 生成缓存键（基于抖音URL）
             cache_key = self._generate_cache_key(douyin_url)
 
-            # 尝试从缓存获取原始API数据
-            cached_data = self.cache.get(cache_key)
-            if cached_data is not None:
-                self.logger.info(f"📦 从缓存获取抖音内容: {douyin_url}")
-                # 将缓存的bytes数据转换回dict
-                import json
-                if isinstance(cached_data, bytes):
-                    cached_data = json.loads(cached_data.decode('utf-8'))
-                elif isinstance(cached_data, str):
-                    cached_data = json.loads(cached_data)
-                # 从缓存的原始API数据中提取视频列表
-                return self._process_api_data(cached_data)
+            # 尝试从缓存获取
+            cached_result = self._get_cached_content(cache_key, douyin_url)
+            if cached_result is not None:
+                return cached_result
 
             # 步骤1: 提取sec_user_id
             success, message, sec_user_id = self.extract_sec_user_id(douyin_url)
@@ -345,19 +524,284 @@ class DouyinFetcher:
             if not success:
                 return False, message, None
 
-            # 缓存原始API数据（转换为JSON字符串）
-            import json
-            api_data_json = json.dumps(api_data, ensure_ascii=False)
-            self.cache.set(cache_key, api_data_json.encode('utf-8'))
-            self.logger.info(f"💾 抖音API数据已缓存: {douyin_url}")
+            # 步骤3: 处理API数据，缓存并返回视频列表
+            return self._store_content(cache_key, douyin_url, self._process_api_data(api_data))
+
+        except Exception as e:
+            self.logger.error(f"获取用户内容失败: {douyin_url}, 错误: {str(e)}", exc_info=True)
+            return False, f"处理失败: {str(e)}", None
+
+    def _get_cached_content(self, cache_key: str, douyin_url: str) -> Optional[Tuple[bool, str, Optional[List[Dict]]]]:
+        """
+        从缓存获取用户内容
+
+        Args:
+            cache_key: 缓存键
+            douyin_url: 抖音用户链接（用于日志）
 
-            # 步骤3: 处理API数据并返回视频列表
-            return self._process_api_data(api_data)
+        Returns:
+            Optional[Tuple[bool, str, Optional[List[Dict]]]]: 缓存命中时返回处理结果，未命中返回None
+        """
+        # 优先使用进程内缓存中的视频列表
+        payload = self.local_cache.get(cache_key)
+        if payload is not None:
+            self.logger.debug(f"📦 从内存缓存获取抖音内容: {douyin_url}")
+            return True, "", json_utils.loads(payload)
+
+        # 尝试从缓存获取已处理的视频列表
+        hit, cached_data = self._get_cached(douyin_url)
+        if not hit:
+            return None
+
+        self.logger.info(f"📦 从缓存获取抖音内容: {douyin_url}")
+        payload = cached_data
+        cached_data = json_utils.loads(payload)
+        if isinstance(cached_data, list):
+            return self._remember_content(cache_key, (True, "", cached_data), payload)
+        # 旧版本缓存的是原始API数据，需要重新提取视频列表
+        return self._remember_content(cache_key, self._process_api_data(cached_data))
+
+    def _remember_content(self, cache_key: str,
+                          result: Tuple[bool, str, Optional[List[Dict]]],
+                          payload: Optional[Union[bytes, str]] = None) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        将处理成功的视频列表以序列化形式保存到进程内缓存
+
+        Args:
+            cache_key: 缓存键
+            result: _process_api_data的处理结果
+            payload: 已序列化的视频列表（为None时重新序列化）
+
+        Returns:
+            Tuple[bool, str, Optional[List[Dict]]]: 原样返回处理结果
+        """
+        if result[0]:
+            self.local_cache.set(cache_key, payload if payload is not None else json_utils.dumps(result[2]))
+        return result
+
+    def _store_content(self, cache_key: str, douyin_url: str,
+                       result: Tuple[bool, str, Optional[List[Dict]]]) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        缓存处理成功的视频列表（缓存命中时无需再解析和遍历原始API数据）
+
+        Args:
+            cache_key: 缓存键
+            douyin_url: 抖音用户链接（用于日志）
+            result: _process_api_data的处理结果
+
+        Returns:
+            Tuple[bool, str, Optional[List[Dict]]]: 原样返回处理结果
+        """
+        if not result[0]:
+            return result
+        ttl = self._adaptive_ttl(cache_key, result[2])
+        payload = json_utils.dumps(result[2])
+        self.cache.set(cache_key, payload, ttl=ttl)
+        self.logger.info(f"💾 抖音视频列表已缓存: {douyin_url}, TTL: {ttl}秒")
+        return self._remember_content(cache_key, result, payload)
+
+    def _adaptive_ttl(self, cache_key: str, video_list: List[Dict]) -> int:
+        """
+        根据账号的发布频率计算缓存TTL（发布越频繁，缓存越短）
+
+        每次获取时用本页视频的平均发布间隔更新该账号的指数移动平均值，
+        观测次数不足时使用默认TTL。
+
+        Args:
+            cache_key: 缓存键
+            video_list: 本次获取的视频列表
+
+        Returns:
+            int: 缓存TTL（秒）
+        """
+        # 置顶视频可能很旧，不参与发布间隔计算
+        create_times = sorted(
+            (video["create_time"] for video in video_list
+             if not video.get("is_top") and video.get("create_time", 0) > 0),
+            reverse=True
+        )
+        ema, samples = self._post_interval_ema.get(cache_key, (None, 0))
+
+        if len(create_times) >= 2:
+            interval = (create_times[0] - create_times[-1]) / (len(create_times) - 1)
+            ema = interval if ema is None else _TTL_EMA_ALPHA * interval + (1 - _TTL_EMA_ALPHA) * ema
+            samples += 1
+            self._post_interval_ema[cache_key] = (ema, samples)
+
+        if ema is None or samples < _TTL_MIN_SAMPLES:
+            return self.cache.default_ttl
+        return int(min(max(ema / 4, _MIN_ADAPTIVE_TTL), _MAX_ADAPTIVE_TTL))
+
+    async def _aresolve_redirect(self, url: str) -> Optional[str]:
+        """
+        异步解析URL重定向
+
+        Args:
+            url: 原始URL
+
+        Returns:
+            Optional[str]: 重定向后的最终URL
+        """
+        try:
+            # 如果已经是完整的用户主页URL，直接返回
+            if any(marker in url for marker in _RESOLVED_URL_MARKERS):
+                return url
+
+            final_url = self.redirect_cache.get(url)
+            if final_url is None:
+                response = await _get_async_client().head(url, timeout=10)
+                final_url = str(response.url)
+                self.redirect_cache.set(url, final_url)
+            self.logger.debug(f"重定向解析: {url} -> {final_url}")
+            return final_url
+
+        except Exception as e:
+            self.logger.error(f"重定向解析失败: {url}, 错误: {str(e)}", exc_info=True)
+            return None
+
+    async def afetch_user_videos(self, sec_user_id: str, max_cursor: int = 0, count: int = 20) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        异步获取用户发布的视频内容（httpx不可用时在线程中执行同步版本）
+
+        Args:
+            sec_user_id: 用户ID
+            max_cursor: 游标位置，用于分页
+            count: 获取数量
+
+        Returns:
+            Tuple[bool, str, Optional[Dict]]: (是否成功, 错误信息, 原始API数据)
+        """
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.fetch_user_videos, sec_user_id, max_cursor, count)
+
+        try:
+            self.logger.info(f"开始异步获取用户视频: {sec_user_id}, cursor: {max_cursor}, count: {count}")
+
+            params = {
+                "sec_user_id": sec_user_id,
+                "max_cursor": max_cursor,
+                "count": count
+            }
+            response = await _get_async_client().get(self.api_base, params=params, timeout=self.timeout)
+            if not response.is_success:
+                self.logger.error(f"请求抖音API失败: {sec_user_id}, HTTP状态码: {response.status_code}")
+                return False, f"网络请求失败: HTTP {response.status_code}", None
+
+            # 解析并检查响应
+            return self._check_api_response(json_utils.loads(response.content))
+
+        except httpx.HTTPError as e:
+            self.logger.error(f"请求抖音API失败: {sec_user_id}, 错误: {str(e)}", exc_info=True)
+            return False, f"网络请求失败: {str(e)}", None
+        except Exception as e:
+            self.logger.error(f"获取用户视频失败: {sec_user_id}, 错误: {str(e)}", exc_info=True)
+            return False, f"处理失败: {str(e)}", None
+
+    async def afetch_user_content(self, douyin_url: str, max_cursor: int = 0, count: int = 20) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        异步从抖音URL获取用户内容（完整流程，httpx不可用时在线程中执行同步版本）
+
+        Args:
+            douyin_url: 抖音用户链接
+            max_cursor: 游标位置
+            count: 获取数量
+
+        Returns:
+            Tuple[bool, str, Optional[List[Dict]]]: (是否成功, 错误信息, 视频列表)
+        """
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.fetch_user_content, douyin_url, max_cursor, count)
+
+        try:
+            cache_key = self._generate_cache_key(douyin_url)
+            cached_result = self._get_cached_content(cache_key, douyin_url)
+            if cached_result is not None:
+                return cached_result
+
+            # 步骤1: 解析重定向并提取sec_user_id
+            final_url = await self._aresolve_redirect(douyin_url)
+            if not final_url:
+                return False, "无法解析重定向链接", None
+            sec_user_id = self._extract_user_id_from_url(final_url)
+            if not sec_user_id:
+                return False, "无法从URL中提取sec_user_id", None
+
+            # 步骤2: 获取用户视频API数据
+            if count > _PAGE_SIZE:
+                success, message, api_data = await self._afetch_user_video_pages(sec_user_id, max_cursor, count)
+            else:
+                success, message, api_data = await self.afetch_user_videos(sec_user_id, max_cursor, count)
+            if not success:
+                return False, message, None
+
+            # 步骤3: 处理API数据，缓存并返回视频列表
+            return self._store_content(cache_key, douyin_url, self._process_api_data(api_data))
 
         except Exception as e:
             self.logger.error(f"获取用户内容失败: {douyin_url}, 错误: {str(e)}", exc_info=True)
             return False, f"处理失败: {str(e)}", None
 
+    async def _afetch_user_video_pages(self, sec_user_id: str, max_cursor: int, count: int) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        分页获取大量视频并合并为一份API数据
+
+        抖音的max_cursor是上一页返回的游标（不是偏移量），页与页之间无法并发，
+        按顺序翻页，每页_PAGE_SIZE条，通过共享客户端复用keep-alive连接。
+
+        Args:
+            sec_user_id: 用户ID
+            max_cursor: 起始游标
+            count: 获取总数量
+
+        Returns:
+            Tuple[bool, str, Optional[Dict]]: (是否成功, 错误信息, 合并后的API数据)
+        """
+        merged_data = None
+        aweme_list: List[Dict] = []
+        cursor = max_cursor
+
+        while len(aweme_list) < count:
+            success, message, api_data = await self.afetch_user_videos(
+                sec_user_id, cursor, min(_PAGE_SIZE, count - len(aweme_list))
+            )
+            if not success:
+                # 第一页失败时整体失败，后续页失败时返回已获取的部分
+                if merged_data is None:
+                    return False, message, None
+                self.logger.warning(f"分页获取中断: {sec_user_id}, {message}")
+                break
+
+            data = api_data.get("data")
+            if not isinstance(data, dict):
+                if merged_data is None:
+                    return True, "", api_data
+                break
+            if merged_data is None:
+                merged_data = api_data
+
+            page = data.get("aweme_list") or []
+            aweme_list.extend(page)
+
+            next_cursor = data.get("max_cursor")
+            if not page or not data.get("has_more") or not next_cursor or next_cursor == cursor:
+                break
+            cursor = next_cursor
+
+        merged_data["data"]["aweme_list"] = aweme_list[:count]
+        return True, "", merged_data
+
+    async def gather_fetch(self, douyin_urls: List[str]) -> List[Tuple[bool, str, Optional[List[Dict]]]]:
+        """
+        并发获取多个抖音用户的内容
+
+        Args:
+            douyin_urls: 抖音用户链接列表
+
+        Returns:
+            List[Tuple[bool, str, Optional[List[Dict]]]]: 与输入顺序对应的获取结果
+        """
+        return await asyncio.gather(*(self.afetch_user_content(url) for url in douyin_urls))
+
     def _process_api_data(self, api_data: Dict) -> Tuple[bool, str, Optional[List[Dict]]]:
         """
         处理API数据，提取视频信息
@@ -379,12 +823,8 @@ class DouyinFetcher:
             if not isinstance(aweme_list, list):
                 return False, "API返回的aweme_list字段格式错误", None
 
-            # 解析视频信息
-            video_list = []
-            for aweme_data in aweme_list:
-                video_info = self._extract_video_info(aweme_data)
-                if video_info:
-                    video_list.append(video_info)
+            # 解析视频信息（跳过提取失败的条目）
+            video_list = [video_info for video_info in map(self._extract_video_info, aweme_list) if video_info is not None]
 
             self.logger.info(f"成功处理API数据，共 {len(video_list)} 个视频")
             return True, "", video_list
@@ -393,6 +833,12 @@ class DouyinFetcher:
             self.logger.error(f"处理API数据失败: {str(e)}", exc_info=True)
             return False, f"处理失败: {str(e)}", None
 
+    def close(self) -> None:
+        """
+        关闭HTTP连接池
+        """
+        self.http.clear()
+
     def generate_content_id(self, video_info: Dict) -> str:
         """
         生成内容ID
@@ -415,24 +861,13 @@ class DouyinFetcher:
         Returns:
             bool: 是否为有效的抖音URL
         """
-        try:
-            # 基本URL格式检查
-            if not url or not isinstance(url, str):
-                return False
-
-            # 检查是否包含抖音域名
-            douyin_domains = [
-                "douyin.com",
-                "v.douyin.com",
-                "iesdouyin.com"
-            ]
-
-            return any(domain in url.lower() for domain in douyin_domains)
-
-        except Exception as e:
-            self.logger.error(f"验证抖音URL失败: {url}, 错误: {str(e)}", exc_info=True)
+        # 基本URL格式检查
+        if not url or not isinstance(url, str):
             return False
 
+        # 检查是否包含抖音域名
+        return _is_douyin_url(url)
+
     def clear_cache(self, douyin_url: str = None) -> bool:
         """
         清除缓存
@@ -447,10 +882,12 @@ class DouyinFetcher:
             if douyin_url:
                 # 清除特定URL的缓存
                 cache_key = self._generate_cache_key(douyin_url)
+                self.local_cache.delete(cache_key)
                 self.cache.delete(cache_key)
                 self.logger.info(f"清除URL缓存: {douyin_url}")
             else:
                 # 清除所有缓存
+                self.local_cache.clear()
                 self.cache.clear()
                 self.logger.info("清除所有缓存")
 
@@ -470,8 +907,8 @@ class DouyinFetcher:
         try:
             return {
                 "cache_type": "douyin1_api",
-                "cache_size": len(self.cache._cache) if hasattr(self.cache, '_cache') else 0,
-                "cache_ttl": self.cache.ttl if hasattr(self.cache, 'ttl') else 0
+                "cache_size": self.cache.size(),
+                "cache_ttl": self.cache.ttl_seconds
             }
         except Exception as e:
             self.logger.error(f"获取缓存信息失败: {str(e)}", exc_info=True)
@@ -488,13 +925,26 @@ class DouyinFetcher:
             bool: 是否命中缓存
         """
         try:
-            cache_key = self._generate_cache_key(douyin_url)
-            cached_data = self.cache.get(cache_key)
-            return cached_data is not None
+            if self.local_cache.exists(self._generate_cache_key(douyin_url)):
+                return True
+            return self._get_cached(douyin_url)[0]
         except Exception as e:
             self.logger.error(f"检查缓存命中失败: {str(e)}", exc_info=True)
             return False
 
+    def _get_cached(self, douyin_url: str) -> Tuple[bool, Optional[Any]]:
+        """
+        从缓存后端读取一次，同时返回是否命中和缓存值
+
+        Args:
+            douyin_url: 抖音URL
+
+        Returns:
+            Tuple[bool, Optional[Any]]: (是否命中, 缓存值)
+        """
+        cached_data = self.cache.get(self._generate_cache_key(douyin_url))
+        return cached_data is not None, cached_data
+
 
 def test_douyin_fetcher(douyin_url: str = None):
     """
@@ -505,8 +955,6 @@ def test_douyin_fetcher(douyin_url: str = None):
     Args:
         douyin_url: 抖音用户主页URL，如果为None则使用默认测试URL
     """
-    import logging
-
     # 配置日志
     logging.basicConfig(
         level=logging.INFO,
@@ -563,8 +1011,8 @@ def test_douyin_fetcher(douyin_url: str = None):
 
         success, message, video_list = fetcher.fetch_user_content(douyin_url, count=10)
 
-        # 检查缓存命中情况（获取后）
-        cache_hit_after = fetcher.is_cache_hit(douyin_url)
+        # 检查缓存命中情况（获取后，直接查询缓存后端确认内容已写入）
+        cache_hit_after = fetcher.cache.exists(fetcher._generate_cache_key(douyin_url))
         print(f"📦 获取后缓存状态: {'✅ 已缓存' if cache_hit_after else '❌ 未缓存'}")
 
         # 显示数据来源
@@ -589,60 +1037,64 @@ def test_douyin_fetcher(douyin_url: str = None):
         print("=" * 80)
 
         for i, video in enumerate(video_list, 1):
-            print(f"视频 {i}:")
-            print(f"  📹 视频ID: {video.get('aweme_id', 'N/A')}")
-            print(f"  📝 描述: {video.get('desc', 'N/A')[:100]}{'...' if len(video.get('desc', '')) > 100 else ''}")
-            print(f"  📅 创建时间: {video.get('create_time', 'N/A')} ({_format_timestamp(video.get('create_time', 0))})")
-            print(f"  ⏱️ 视频时长: {_format_duration(video.get('duration', 0))}")
-            print(f"  📌 是否置顶: {'是' if video.get('is_top', 0) else '否'}")
+            parts = []
+            parts.append(f"视频 {i}:")
+            parts.append(f"  📹 视频ID: {video.get('aweme_id', 'N/A')}")
+            parts.append(f"  📝 描述: {video.get('desc', 'N/A')[:100]}{'...' if len(video.get('desc', '')) > 100 else ''}")
+            parts.append(f"  📅 创建时间: {video.get('create_time', 'N/A')} ({_format_timestamp(video.get('create_time', 0))})")
+            parts.append(f"  ⏱️ 视频时长: {_format_duration(video.get('duration', 0))}")
+            parts.append(f"  📌 是否置顶: {'是' if video.get('is_top', 0) else '否'}")
 
             # 作者信息
             author = video.get('author', {})
             if author:
-                print(f"  👤 作者昵称: {author.get('nickname', 'N/A')}")
-                print(f"  🆔 作者UID: {author.get('uid', 'N/A')}")
-                print(f"  ✍️ 作者签名: {author.get('signature', 'N/A')[:50]}{'...' if len(author.get('signature', '')) > 50 else ''}")
+                parts.append(f"  👤 作者昵称: {author.get('nickname', 'N/A')}")
+                parts.append(f"  🆔 作者UID: {author.get('uid', 'N/A')}")
+                parts.append(f"  ✍️ 作者签名: {author.get('signature', 'N/A')[:50]}{'...' if len(author.get('signature', '')) > 50 else ''}")
 
             # 统计信息
             stats = video.get('statistics', {})
             if stats:
-                print(f"  📊 播放量: {_format_number(stats.get('play_count', 0))}")
-                print(f"  👍 点赞量: {_format_number(stats.get('digg_count', 0))}")
-                print(f"  💬 评论量: {_format_number(stats.get('comment_count', 0))}")
-                print(f"  📤 分享量: {_format_number(stats.get('share_count', 0))}")
-                print(f"  ⭐ 收藏量: {_format_number(stats.get('collect_count', 0))}")
+                parts.append(f"  📊 播放量: {_format_number(stats.get('play_count', 0))}")
+                parts.append(f"  👍 点赞量: {_format_number(stats.get('digg_count', 0))}")
+                parts.append(f"  💬 评论量: {_format_number(stats.get('comment_count', 0))}")
+                parts.append(f"  📤 分享量: {_format_number(stats.get('share_count', 0))}")
+                parts.append(f"  ⭐ 收藏量: {_format_number(stats.get('collect_count', 0))}")
 
             # 视频信息
             video_info = video.get('video', {})
             if video_info:
-                print(f"  🎬 视频尺寸: {video_info.get('width', 0)}x{video_info.get('height', 0)}")
-                print(f"  💾 文件大小: {_format_file_size(video_info.get('data_size', 0))}")
-                print(f"  🔗 视频URI: {video_info.get('uri', 'N/A')}")
+                parts.append(f"  🎬 视频尺寸: {video_info.get('width', 0)}x{video_info.get('height', 0)}")
+                parts.append(f"  💾 文件大小: {_format_file_size(video_info.get('data_size', 0))}")
+                parts.append(f"  🔗 视频URI: {video_info.get('uri', 'N/A')}")
 
                 # 显示第一个播放URL
                 url_list = video_info.get('url_list', [])
                 if url_list:
-                    print(f"  🎥 播放链接: {url_list[0][:60]}{'...' if len(url_list[0]) > 60 else ''}")
-                    print(f"  📱 可用链接数: {len(url_list)}")
+                    parts.append(f"  🎥 播放链接: {url_list[0][:60]}{'...' if len(url_list[0]) > 60 else ''}")
+                    parts.append(f"  📱 可用链接数: {len(url_list)}")
 
             # 封面信息
             cover = video.get('cover', {})
             if cover and cover.get('url_list'):
                 cover_urls = cover.get('url_list', [])
-                print(f"  🖼️ 封面链接: {cover_urls[0][:60]}{'...' if len(cover_urls[0]) > 60 else ''}")
+                parts.append(f"  🖼️ 封面链接: {cover_urls[0][:60]}{'...' if len(cover_urls[0]) > 60 else ''}")
 
             # 音乐信息
             music = video.get('music', {})
             if music:
-                print(f"  🎵 音乐标题: {music.get('title', 'N/A')}")
-                print(f"  🎤 音乐作者: {music.get('author', 'N/A')}")
+                parts.append(f"  🎵 音乐标题: {music.get('title', 'N/A')}")
+                parts.append(f"  🎤 音乐作者: {music.get('author', 'N/A')}")
 
             # 分享链接
             share_url = video.get('share_url', '')
             if share_url:
-                print(f"  🔗 分享链接: {share_url}")
+                parts.append(f"  🔗 分享链接: {share_url}")
 
-            print("-" * 80)
+            parts.append("-" * 80)
+
+            # 每个视频的信息一次性输出，减少逐行print的加锁和刷新
+            print(*parts, sep="\n")
 
                 # 步骤5: 缓存详细信息
         print("\n步骤5: 缓存详细信息")
@@ -652,8 +1104,8 @@ def test_douyin_fetcher(douyin_url: str = None):
         cache_type = type(fetcher.cache).__name__
         print(f"📋 缓存类型: {cache_type}")
 
-        # 缓存状态
-        is_cached = fetcher.is_cache_hit(douyin_url)
+        # 缓存状态（仅检查键是否存在，不读取缓存值）
+        is_cached = fetcher.cache.exists(fetcher._generate_cache_key(douyin_url))
         print(f"📦 缓存状态: {'✅ 已缓存' if is_cached else '❌ 未缓存'}")
 
         # 缓存键
@@ -667,13 +1119,21 @@ def test_douyin_fetcher(douyin_url: str = None):
             print(f"   {key}: {value}")
 
         print("\n✅ 测试完成！")
+        fetcher.close()
 
     except Exception as e:
         print(f"\n❌ 测试过程中发生错误: {str(e)}")
-        import traceback
         traceback.print_exc()
 
 
+# 测试输出格式化使用的数量单位
+_YI = 10 ** 8    # 1亿
+_WAN = 10 ** 4   # 1万
+_GB = 1024 ** 3
+_MB = 1024 ** 2
+_KB = 1024
+
+
 def _format_timestamp(timestamp: int) -> str:
     """
     格式化时间戳为可读时间
@@ -684,14 +1144,12 @@ def _format_timestamp(timestamp: int) -> str:
     Returns:
         str: 格式化的时间字符串
     """
-    try:
-        if timestamp <= 0:
-            return "未知时间"
+    if not isinstance(timestamp, (int, float)) or timestamp <= 0:
+        return "未知时间"
 
-        from datetime import datetime
-        dt = datetime.fromtimestamp(timestamp)
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except:
+    try:
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    except (ValueError, OverflowError, OSError):
         return "时间格式错误"
 
 
@@ -732,10 +1190,10 @@ def _format_number(number: int) -> str:
         str: 格式化的数字字符串
     """
     try:
-        if number >= 100000000:  # 1亿
-            return f"{number / 100000000:.1f}亿"
-        elif number >= 10000:  # 1万
-            return f"{number / 10000:.1f}万"
+        if number >= _YI:
+            return f"{number / _YI:.1f}亿"
+        elif number >= _WAN:
+            return f"{number / _WAN:.1f}万"
         else:
             return str(number)
     except:
@@ -756,12 +1214,12 @@ def _format_file_size(size_bytes: int) -> str:
         if size_bytes <= 0:
             return "未知大小"
 
-        if size_bytes >= 1024 * 1024 * 1024:  # GB
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
-        elif size_bytes >= 1024 * 1024:  # MB
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        elif size_bytes >= 1024:  # KB
-            return f"{size_bytes / 1024:.1f} KB"
+        if size_bytes >= _GB:
+            return f"{size_bytes / _GB:.1f} GB"
+        elif size_bytes >= _MB:
+            return f"{size_bytes / _MB:.1f} MB"
+        elif size_bytes >= _KB:
+            return f"{size_bytes / _KB:.1f} KB"
         else:
             return f"{size_bytes} B"
     except:
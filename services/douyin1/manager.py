@@ -15,20 +15,55 @@
 创建时间: 2024年
 """
 
-import logging
 import asyncio
-from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime
+import hashlib
+from itertools import compress
 from pathlib import Path
+from typing import Dict, List, Set, Tuple, Optional, Any
 from telegram import Bot
 
 from services.common.unified_manager import UnifiedContentManager
-from services.common.message_converter import get_converter, ConverterType
+from services.common.unified_interval_manager import UnifiedIntervalManager
 from . import MODULE_NAME, MODULE_DISPLAY_NAME, MODULE_DESCRIPTION, DATA_DIR_PREFIX
 from .fetcher import DouyinFetcher
 from .converter import DouyinConverter
 
 
+# 向剩余频道转发时的最大并发数（每个并发槽位仍按转发间隔发送，兼顾Telegram限流）
+_FORWARD_CONCURRENCY = 4
+
+# 已知内容ID日志文件名（每行一个ID，新ID直接追加到末尾）
+_KNOWN_IDS_LOG_FILENAME = "known_item_ids.log"
+
+# 基类使用的已知内容ID列表文件名（迁移到日志格式后删除）
+_KNOWN_IDS_JSON_FILENAME = "known_item_ids.json"
+
+
+class _PacedForwardIntervalManager(UnifiedIntervalManager):
+    """
+    并发转发共用的间隔管理器
+
+    发送前等待和错误后等待（含Flood Control惩罚）依次进行，
+    多个并发槽位共享同一发送节奏，某个槽位触发限流时其他槽位的后续发送也会等待。
+    """
+
+    def __init__(self):
+        """初始化转发场景的间隔管理器"""
+        super().__init__("forward")
+        self._pacing_lock = asyncio.Lock()
+
+    async def wait_before_send(self, content_index: int, total_content: int,
+                               recent_error_rate: float = 0.0) -> None:
+        """发送前等待（与其他槽位的等待依次进行）"""
+        async with self._pacing_lock:
+            await super().wait_before_send(content_index, total_content, recent_error_rate)
+
+    async def wait_after_error(self, error_type: str, retry_count: int = 0) -> None:
+        """错误后等待（等待期间其他槽位不会开始新的发送）"""
+        async with self._pacing_lock:
+            await super().wait_after_error(error_type, retry_count)
+
+
 class ContentManager(UnifiedContentManager):
     """
     内容管理器
@@ -52,6 +87,12 @@ class ContentManager(UnifiedContentManager):
         self.fetcher = DouyinFetcher()
         self.message_converter = DouyinConverter()
 
+        # 已知内容ID集合（按源URL缓存，首次使用时从已知列表构建，随保存同步更新）
+        self._known_id_sets: Dict[str, Set[str]] = {}
+
+        # 已写入日志文件的ID数量（按源URL记录，用于判断本次保存是否只是追加）
+        self._known_ids_persisted_len: Dict[str, int] = {}
+
         self.logger.info(f"{MODULE_DISPLAY_NAME}管理器初始化完成")
 
     def fetch_latest_content(self, source_url: str) -> Tuple[bool, str, Optional[List[Dict]]]:
@@ -72,37 +113,226 @@ class ContentManager(UnifiedContentManager):
                 return False, "无效的抖音URL格式", None
 
             # 使用获取器获取内容
-            success, message, content_list = self.fetcher.fetch_user_content(source_url)
+            return self._filter_new_content(source_url, self.fetcher.fetch_user_content(source_url))
 
-            if not success:
-                return False, message, None
-
-            if not content_list:
-                return True, "没有新内容", None
+        except Exception as e:
+            self.logger.error(f"获取最新内容失败: {str(e)}", exc_info=True)
+            return False, str(e), None
 
-            # 过滤已知内容
-            new_content = []
-            for content_data in content_list:
-                content_id = self.generate_content_id(content_data)
-                if not self.is_known_item(source_url, content_id):
-                    new_content.append(content_data)
+    async def fetch_latest_content_async(self, source_url: str) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        异步获取最新内容（供调度器并发预取多个账号）
 
-            if not new_content:
-                return True, "没有新内容", None
+        Args:
+            source_url: 账号URL
 
-            # 按时间排序
-            new_content = self._sort_content_by_time(new_content)
+        Returns:
+            Tuple[bool, str, Optional[List[Dict]]]: (是否成功, 消息, 内容列表)
+        """
+        try:
+            self.logger.info(f"异步获取最新内容: {source_url}")
 
-            # 只返回最近的10个内容
-            # new_content = new_content[:10]
+            if not self.fetcher.validate_douyin_url(source_url):
+                return False, "无效的抖音URL格式", None
 
-            self.logger.info(f"获取到 {len(new_content)} 个新内容")
-            return True, "success", new_content
+            result = await self.fetcher.afetch_user_content(source_url)
+            return self._filter_new_content(source_url, result)
 
         except Exception as e:
-            self.logger.error(f"获取最新内容失败: {str(e)}", exc_info=True)
+            self.logger.error(f"异步获取最新内容失败: {str(e)}", exc_info=True)
             return False, str(e), None
 
+    def _filter_new_content(self, source_url: str,
+                            fetch_result: Tuple[bool, str, Optional[List[Dict]]]) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        从获取结果中过滤出新内容并按时间排序
+
+        Args:
+            source_url: 账号URL
+            fetch_result: 获取器返回的 (是否成功, 消息, 内容列表)
+
+        Returns:
+            Tuple[bool, str, Optional[List[Dict]]]: (是否成功, 消息, 新内容列表)
+        """
+        success, message, content_list = fetch_result
+
+        if not success:
+            return False, message, None
+
+        if not content_list:
+            return True, "没有新内容", None
+
+        # 过滤已知内容：先批量生成ID，再用集合差集判断，全部已知时直接返回
+        content_ids = list(map(self.generate_content_id, content_list))
+        known = self._get_known_id_set(source_url)
+        if known.issuperset(content_ids):
+            return True, "没有新内容", None
+        new_content = list(compress(content_list, [cid not in known for cid in content_ids]))
+
+        if not new_content:
+            return True, "没有新内容", None
+
+        # 按时间排序
+        new_content = self._sort_content_by_time(new_content)
+
+        # 只返回最近的10个内容
+        # new_content = new_content[:10]
+
+        self.logger.info(f"获取到 {len(new_content)} 个新内容")
+        return True, "success", new_content
+
+    async def _forward_to_remaining_channels(self, bot: Bot, content: Dict, source_url: str,
+                                             remaining_channels: List[str],
+                                             successful_channels: Dict[str, List[int]], converter) -> None:
+        """
+        并发转发到剩余频道（信号量限制同时进行的转发数，单个慢频道不再阻塞其他频道）
+
+        Args:
+            bot: Telegram Bot实例
+            content: 内容数据
+            source_url: 账号URL
+            remaining_channels: 尚未收到内容的频道列表
+            successful_channels: 已成功的频道及其消息ID（转发成功后原地更新）
+            converter: 消息转换器（降级直接发送时使用）
+        """
+        self.logger.info(f"🔄 开始并发转发到剩余 {len(remaining_channels)} 个频道，并发数: {_FORWARD_CONCURRENCY}")
+        forward_interval_manager = _PacedForwardIntervalManager()
+        sem = asyncio.Semaphore(_FORWARD_CONCURRENCY)
+
+        # 转发来源在并发开始前固定下来，避免并发任务写入successful_channels时被其他任务读取
+        source_channels = list(successful_channels.items())
+
+        async def forward_bounded(channel_index: int, channel: str) -> bool:
+            async with sem:
+                # 每个槽位发送前都按转发间隔等待（依次进行，保持动态间隔和错误率调整）
+                await forward_interval_manager.wait_before_send(
+                    content_index=channel_index,
+                    total_content=len(remaining_channels),
+                    recent_error_rate=forward_interval_manager.get_recent_error_rate()
+                )
+                return await self._forward_to_channel(bot, content, source_url, channel, successful_channels,
+                                                      forward_interval_manager, converter, source_channels)
+
+        await asyncio.gather(*(forward_bounded(i, channel) for i, channel in enumerate(remaining_channels)))
+
+        self.logger.info(f"📊 转发统计: {forward_interval_manager.get_statistics_summary()}")
+
+    def _get_known_id_set(self, source_url: str) -> Set[str]:
+        """
+        获取已知内容ID集合（首次使用时由已知ID列表构建）
+
+        Args:
+            source_url: 账号URL
+
+        Returns:
+            Set[str]: 已知内容ID集合
+        """
+        known_set = self._known_id_sets.get(source_url)
+        if known_set is None:
+            known_set = set(self.get_known_item_ids(source_url))
+            self._known_id_sets[source_url] = known_set
+        return known_set
+
+    def is_known_item(self, source_url: str, item_id: str) -> bool:
+        """
+        检查内容是否已知（集合查找，替代基类的列表线性扫描）
+
+        Args:
+            source_url: 账号URL
+            item_id: 内容ID
+
+        Returns:
+            bool: 是否已知
+        """
+        try:
+            return item_id in self._get_known_id_set(source_url)
+        except Exception as e:
+            self.logger.error(f"检查已知条目失败: {source_url}/{item_id}, 错误: {str(e)}", exc_info=True)
+            return False
+
+    def _known_ids_log_path(self, source_url: str) -> Path:
+        """
+        获取已知内容ID日志文件路径
+
+        Args:
+            source_url: 账号URL
+
+        Returns:
+            Path: 日志文件路径
+        """
+        return self.data_storage_dir / self._safe_filename(source_url) / _KNOWN_IDS_LOG_FILENAME
+
+    def get_known_item_ids(self, source_url: str) -> List[str]:
+        """
+        获取已知的内容ID列表（从逐行追加的日志文件读取）
+
+        日志文件不存在时回退到基类的JSON列表文件，下次保存时自动迁移为日志格式并删除JSON文件。
+
+        Args:
+            source_url: 账号URL
+
+        Returns:
+            List[str]: 已知内容ID列表
+        """
+        try:
+            known_items = self._known_items_cache.get(source_url)
+            if known_items is not None:
+                return known_items.copy()
+
+            log_file = self._known_ids_log_path(source_url)
+            if log_file.exists():
+                known_items = [line for line in log_file.read_text(encoding='utf-8').splitlines() if line]
+                self._known_items_cache[source_url] = known_items
+                self._known_ids_persisted_len[source_url] = len(known_items)
+                return known_items.copy()
+
+        except Exception as e:
+            self.logger.error(f"读取已知条目日志失败: {source_url}, 错误: {str(e)}", exc_info=True)
+
+        return super().get_known_item_ids(source_url)
+
+    def save_known_item_ids(self, source_url: str, item_ids: List[str]):
+        """
+        保存已知的内容ID列表，并同步更新ID集合
+
+        新列表只是在原列表末尾追加ID时（添加/标记已发送），只向日志追加新行；
+        其他情况（清理旧条目、从JSON迁移）才整体重写文件，并删除已迁移的JSON文件。
+
+        基类只会在末尾追加或从头部裁剪，因此比较已持久化部分的首尾ID即可判断是否为追加，
+        无需复制和逐项比较整个列表。
+
+        Args:
+            source_url: 账号URL
+            item_ids: 内容ID列表
+        """
+        try:
+            previous = self._known_items_cache.get(source_url)
+            persisted = self._known_ids_persisted_len.get(source_url)
+            log_file = self._known_ids_log_path(source_url)
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+
+            is_append = (
+                previous is not None and persisted == len(previous) and len(item_ids) >= persisted
+                and (persisted == 0 or (item_ids[0] == previous[0] and item_ids[persisted - 1] == previous[-1]))
+                and log_file.exists()
+            )
+            if is_append:
+                if len(item_ids) > persisted:
+                    with open(log_file, 'a', encoding='utf-8') as f:
+                        f.write(''.join(f"{item_ids[i]}\n" for i in range(persisted, len(item_ids))))
+            else:
+                log_file.write_text(''.join(f"{item_id}\n" for item_id in item_ids), encoding='utf-8')
+                # 日志已包含完整列表，删除旧的JSON文件，避免其他读取方拿到过期数据
+                log_file.with_name(_KNOWN_IDS_JSON_FILENAME).unlink(missing_ok=True)
+
+            self._known_items_cache[source_url] = list(item_ids)
+            self._known_ids_persisted_len[source_url] = len(item_ids)
+            self._known_id_sets[source_url] = set(item_ids)
+            self.logger.debug(f"保存已知条目ID成功: {source_url}, {len(item_ids)} 个")
+
+        except Exception as e:
+            self.logger.error(f"保存已知条目ID失败: {source_url}, 错误: {str(e)}", exc_info=True)
+
     def generate_content_id(self, content_data: Dict) -> str:
         """
         生成内容ID
@@ -114,7 +344,18 @@ class ContentManager(UnifiedContentManager):
             str: 内容ID
         """
         # 使用抖音视频的aweme_id作为内容标识
-        return content_data.get('aweme_id', content_data.get('id', 'unknown'))
+        content_id = content_data.get('aweme_id') or content_data.get('id')
+        if content_id:
+            return content_id
+
+        # 缺少ID时使用规范字段的内容哈希，避免不同内容共用同一个'unknown'标识
+        # （每次现算，不写回内容数据，避免私有字段进入latest.json等持久化数据）
+        video = content_data.get('video') or {}
+        canonical = (
+            f"{content_data.get('desc', '')}|{content_data.get('share_url', '')}|"
+            f"{content_data.get('create_time', 0)}|{video.get('uri', '')}"
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
 
     def _sort_content_by_time(self, content_list: List[Dict]) -> List[Dict]:
         """
@@ -127,12 +368,8 @@ class ContentManager(UnifiedContentManager):
             List[Dict]: 排序后的内容列表（从旧到新）
         """
         try:
-            # 按create_time字段排序（Unix时间戳）
-            return sorted(
-                content_list,
-                key=lambda x: x.get('create_time', 0),
-                reverse=False  # 最旧的在前（从旧到新）
-            )
+            # 按create_time字段排序（Unix时间戳），最旧的在前（从旧到新），不修改调用方的数据
+            return sorted(content_list, key=lambda c: c.get('create_time', 0))
         except Exception as e:
             self.logger.error(f"内容排序失败: {str(e)}", exc_info=True)
             return content_list
@@ -16,9 +16,10 @@ Douyin1调度器模块
 """
 
 import asyncio
+import functools
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from telegram import Bot
 
 from .manager import ContentManager, create_content_manager
@@ -26,6 +27,10 @@ from . import MODULE_NAME, MODULE_DISPLAY_NAME, DATA_DIR_PREFIX
 from services.common.unified_scheduler import UnifiedScheduler
 
 
+# 定时检查时并发预取账号内容的最大并发数
+_FETCH_CONCURRENCY = 8
+
+
 class Douyin1Scheduler(UnifiedScheduler):
     """
     Douyin1定时任务调度器
@@ -79,6 +84,59 @@ class Douyin1Scheduler(UnifiedScheduler):
         # 抖音源一般不需要跳过，除非有特殊需求
         return False
 
+    async def run_scheduled_check(self, bot: Bot) -> None:
+        """
+        执行定时检查（先并发预取所有账号内容，再按统一流程逐个检查和发送）
+
+        预取结果写入获取器缓存，后续check_updates中的同步获取直接命中缓存，
+        网络耗时从逐个账号串行等待变为按并发数分批等待。
+
+        Args:
+            bot: Telegram Bot实例
+        """
+        try:
+            await self._prefetch_sources()
+        except Exception as e:
+            self.logger.error(f"Douyin1并发预取失败: {str(e)}", exc_info=True)
+
+        await super().run_scheduled_check(bot)
+
+    async def _prefetch_sources(self) -> None:
+        """
+        并发预取所有订阅账号的原始内容（只预热获取器缓存，不做已知内容过滤）
+        """
+        # 先刷新订阅缓存，确保预取的是本轮要检查的账号（与统一流程的刷新保持一致）
+        self.manager._load_subscriptions()
+
+        fetcher = self.manager.fetcher
+        source_urls = [
+            url for url in self.manager.get_subscriptions()
+            if not self.should_skip_source(url) and fetcher.validate_douyin_url(url)
+        ]
+        if not source_urls:
+            return
+
+        self.logger.info(f"🚀 开始并发预取 {len(source_urls)} 个抖音账号，并发数: {_FETCH_CONCURRENCY}")
+        sem = asyncio.Semaphore(_FETCH_CONCURRENCY)
+        results = await asyncio.gather(*(self._bounded_fetch(sem, url) for url in source_urls))
+
+        failed = sum(1 for success, _, _ in results if not success)
+        self.logger.info(f"📥 并发预取完成: 成功 {len(results) - failed} 个，失败 {failed} 个")
+
+    async def _bounded_fetch(self, sem: asyncio.Semaphore, source_url: str) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        在并发数限制内获取单个账号的原始内容（结果写入获取器缓存）
+
+        Args:
+            sem: 并发控制信号量
+            source_url: 抖音账号URL
+
+        Returns:
+            Tuple[bool, str, Optional[List[Dict]]]: (是否成功, 消息, 视频列表)
+        """
+        async with sem:
+            return await self.manager.fetcher.afetch_user_content(source_url)
+
     async def cleanup_old_files(self) -> None:
         """
         清理过期文件（Douyin1特定的清理逻辑）
@@ -109,8 +167,15 @@ def create_douyin1_scheduler(data_dir: str = None) -> Douyin1Scheduler:
     return Douyin1Scheduler(data_dir)
 
 
-# 创建全局调度器实例
-douyin1_scheduler = Douyin1Scheduler()
+@functools.lru_cache(maxsize=1)
+def _get_scheduler() -> Douyin1Scheduler:
+    """
+    获取全局调度器实例（首次调用时创建，避免导入模块时读取数据文件）
+
+    Returns:
+        Douyin1Scheduler: 全局Douyin1调度器实例
+    """
+    return Douyin1Scheduler()
 
 
 # 导出函数供telegram_bot调用
@@ -121,7 +186,7 @@ async def run_scheduled_check(bot: Bot) -> None:
     Args:
         bot: Telegram Bot实例
     """
-    await douyin1_scheduler.run_scheduled_check(bot)
+    await _get_scheduler().run_scheduled_check(bot)
 
 
 if __name__ == "__main__":
@@ -134,7 +199,7 @@ if __name__ == "__main__":
         print("=" * 80)
 
         # 创建调度器 - 使用真实数据目录
-        scheduler = douyin1_scheduler
+        scheduler = _get_scheduler()
         print(f"✅ 创建Douyin1调度器: {type(scheduler).__name__}")
         print(f"📂 数据目录: storage/douyin1")
         print()
@@ -103,11 +103,10 @@ def verify_known_items() -> bool:
             if known_items_file.exists():
                 source_count += 1
     
-    # 检查目标目录
+    # 检查目标目录（douyin1保存已知内容后会从JSON迁移为日志格式）
     for safe_dir in target_data_dir.iterdir():
         if safe_dir.is_dir():
-            known_items_file = safe_dir / "known_item_ids.json"
-            if known_items_file.exists():
+            if (safe_dir / "known_item_ids.log").exists() or (safe_dir / "known_item_ids.json").exists():
                 target_count += 1
     
     print(f"📊 源目录已知内容文件: {source_count} 个")